@@ -0,0 +1,94 @@
+"""
+Measure the dashboard (`/`) latency, first alone and then while another session keeps
+toggling the revision checkboxes (writes) of the same hafiz.
+
+It writes to the app database (DB_PATH in main.py), each checkbox is toggled on and off,
+so run it against a copy of the database.
+
+Usage: python benchmark_dashboard.py email password hafiz_id [requests]
+"""
+
+import sys
+import time
+import threading
+import statistics
+from starlette.testclient import TestClient
+
+import main
+
+
+def login(email, password, hafiz_id):
+    client = TestClient(main.app, follow_redirects=False)
+    client.post("/login", data={"email": email, "password": password})
+    client.post("/hafiz_selection", data={"current_hafiz_id": hafiz_id})
+    return client
+
+
+def measure_dashboard(client, requests):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get("/")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.status_code
+    return latencies
+
+
+def toggle_checkboxes(client, hafiz_id, stop):
+    """Check and uncheck the items of the current date, until `stop` is set"""
+    current_date = main.get_current_date(hafiz_id)
+    rows = main.db.q(
+        f"SELECT item_id, mode_id FROM hafizs_items WHERE hafiz_id = {hafiz_id} AND mode_id IN (3, 4) LIMIT 10"
+    )
+    writes = 0
+    while not stop.is_set() and rows:
+        for row in rows:
+            for is_checked in (True, False):
+                client.post(
+                    f"/home/add/{row['item_id']}",
+                    data={
+                        "date": current_date,
+                        "mode_id": row["mode_id"],
+                        "rating": 1,
+                        "is_checked": is_checked,
+                    },
+                )
+                writes += 1
+    return writes
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<20} p50: {statistics.median(latencies):7.1f} ms   p95: {p95:7.1f} ms   max: {latencies[-1]:7.1f} ms"
+    )
+
+
+def benchmark_dashboard(email, password, hafiz_id, requests=50):
+    reader = login(email, password, hafiz_id)
+    writer = login(email, password, hafiz_id)
+    measure_dashboard(reader, 3)  # warm up the caches
+
+    report("dashboard", measure_dashboard(reader, requests))
+
+    stop = threading.Event()
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(writes=toggle_checkboxes(writer, hafiz_id, stop))
+    )
+    thread.start()
+    latencies = measure_dashboard(reader, requests)
+    stop.set()
+    thread.join()
+    report("dashboard + writes", latencies)
+    print(f"{result.get('writes', 0)} checkbox writes ran concurrently")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+    email, password, hafiz_id = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    requests = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+    benchmark_dashboard(email, password, hafiz_id, requests)
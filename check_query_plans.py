@@ -0,0 +1,211 @@
+"""
+Run `EXPLAIN QUERY PLAN` over the hot queries of the app and flag the ones
+that still do a full table scan on `revisions`, `hafizs_items` or `daily_progress`.
+The query shapes of functions no longer in main.py are reported as stale.
+
+Usage: python check_query_plans.py [db_path]
+"""
+
+import os
+import sys
+import ast
+import sqlite3
+
+DB_PATH = "data/quran_v9.db"
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+# Query shapes used in main.py, with sample values. The key starts with the name of the function
+# running the query, `check_query_plans` fails when that function no longer exists in main.py.
+QUERIES = {
+    "checkbox_update_logic": """
+        SELECT * FROM revisions
+        WHERE revision_date = '2025-01-01' AND item_id = 1 AND mode_id = 3 AND hafiz_id = 1
+    """,
+    "checkbox_update_logic (plan)": """
+        SELECT * FROM revisions
+        WHERE revision_date = '2025-01-01' AND item_id = 1 AND mode_id = 1 AND plan_id = 1 AND hafiz_id = 1
+    """,
+    "get_lastest_date": """
+        SELECT * FROM revisions
+        WHERE item_id = 1 AND mode_id IN (2, 3) AND hafiz_id = 1
+        ORDER BY revision_date DESC LIMIT 1
+    """,
+    "get_hafizs_items": """
+        SELECT * FROM hafizs_items WHERE item_id = 1 AND hafiz_id = 1
+    """,
+    "load_dashboard_snapshot (items)": """
+        SELECT items.id, pages.page_number, surahs.name, hafizs_items.mode_id FROM items
+        LEFT JOIN pages ON items.page_id = pages.id
+        LEFT JOIN surahs ON items.surah_id = surahs.id
+        LEFT JOIN hafizs_items ON items.id = hafizs_items.item_id AND hafizs_items.hafiz_id = 1
+        ORDER BY items.id ASC
+    """,
+    "load_dashboard_snapshot (revisions)": """
+        SELECT id, item_id, mode_id, rating, plan_id, revision_date FROM revisions
+        WHERE hafiz_id = 1 AND revision_date IN ('2025-01-01', '2024-12-31')
+        ORDER BY id ASC
+    """,
+    "load_dashboard_snapshot (mode counts)": """
+        SELECT item_id, mode_id, COUNT(*) FROM revisions
+        WHERE hafiz_id = 1 GROUP BY item_id, mode_id
+    """,
+    "load_dashboard_snapshot (plan revisions)": """
+        SELECT id, item_id, revision_date FROM revisions
+        WHERE hafiz_id = 1 AND mode_id = 1 AND plan_id = 1
+        ORDER BY revision_date ASC, id ASC
+    """,
+    "load_dashboard_snapshot (last memorized)": """
+        SELECT item_id FROM revisions WHERE hafiz_id = 1 AND mode_id = 2
+        ORDER BY revision_date DESC, id DESC LIMIT 1
+    """,
+    "get_daily_progress": """
+        SELECT revision_date, mode_id, page_count, revision_count, revision_ids FROM daily_progress
+        WHERE hafiz_id = 1 AND revision_date BETWEEN '2024-12-31' AND '2025-01-01'
+    """,
+    "bulk_update_revisions (existing revisions)": """
+        SELECT id, item_id FROM revisions
+        WHERE hafiz_id = 1 AND revision_date = '2025-01-01' AND mode_id = 3
+        AND item_id IN (1, 2, 3)
+        ORDER BY id ASC
+    """,
+    "bulk_update_revisions (latest review)": """
+        SELECT item_id, MAX(revision_date) AS revision_date FROM revisions
+        WHERE hafiz_id = 1 AND mode_id IN (2, 3) AND item_id IN (1, 2, 3)
+        GROUP BY item_id
+    """,
+    "graduate_reviewed_items (graduation)": """
+        WITH reviewed AS (
+            SELECT DISTINCT item_id, mode_id FROM revisions
+            WHERE hafiz_id = 1 AND revision_date = '2025-01-01' AND mode_id IN (3, 4, 5)
+        ),
+        mode_counts AS (
+            SELECT revisions.item_id, revisions.mode_id, COUNT(*) AS count FROM revisions
+            JOIN reviewed ON revisions.item_id = reviewed.item_id AND revisions.mode_id = reviewed.mode_id
+            WHERE revisions.hafiz_id = 1
+            GROUP BY revisions.item_id, revisions.mode_id
+        )
+        SELECT reviewed.item_id, reviewed.mode_id FROM reviewed
+        JOIN mode_counts ON reviewed.item_id = mode_counts.item_id AND reviewed.mode_id = mode_counts.mode_id
+        LEFT JOIN hafizs_items ON hafizs_items.item_id = reviewed.item_id AND hafizs_items.hafiz_id = 1
+        LEFT JOIN srs_booster_pack ON hafizs_items.srs_booster_pack_id = srs_booster_pack.id
+        WHERE (reviewed.mode_id IN (3, 4) AND mode_counts.count > 6)
+        OR (reviewed.mode_id = 5 AND hafizs_items.next_interval > srs_booster_pack.end_interval)
+    """,
+    "graduate_reviewed_items (latest review)": """
+        SELECT item_id, MAX(revision_date) AS revision_date FROM revisions
+        WHERE hafiz_id = 1 AND mode_id IN (2, 3) AND item_id IN (1, 2, 3)
+        GROUP BY item_id
+    """,
+    "close_dates (reviewed dates)": """
+        SELECT DISTINCT revision_date FROM revisions
+        WHERE hafiz_id = 1 AND mode_id IN (3, 4, 5)
+        AND revision_date >= '2025-01-01' AND revision_date < '2025-01-08'
+        ORDER BY revision_date ASC
+    """,
+    "datewise_summary_table (earliest date)": """
+        SELECT MIN(revision_date) FROM revisions WHERE revisions.hafiz_id = 1
+    """,
+    "datewise_summary_table (window)": """
+        SELECT revisions.id, revisions.item_id, revisions.revision_date, revisions.mode_id, items.page_id
+        FROM revisions LEFT JOIN items ON revisions.item_id = items.id
+        WHERE revisions.hafiz_id = 1 AND revisions.revision_date BETWEEN '2024-12-03' AND '2025-01-01'
+        ORDER BY revisions.id ASC
+    """,
+    "generate_revision_table_part": """
+        SELECT revisions.id, items.page_id, surahs.name, pages.juz_number FROM revisions
+        LEFT JOIN items ON revisions.item_id = items.id
+        LEFT JOIN surahs ON items.surah_id = surahs.id
+        LEFT JOIN pages ON items.page_id = pages.id
+        WHERE revisions.hafiz_id = 1 AND revisions.id < 100
+        ORDER BY revisions.id DESC LIMIT 20
+    """,
+    "get_recent_review_grid": """
+        SELECT item_id, revision_date, mode_id FROM revisions
+        WHERE hafiz_id = 1 AND mode_id IN (2, 3) AND item_id IN (1, 2, 3)
+        AND revision_date BETWEEN '2024-12-19' AND '2025-01-01'
+    """,
+    "watch_list_view": """
+        SELECT revisions.id, revisions.item_id, revisions.revision_date, revisions.rating
+        FROM revisions
+        WHERE revisions.hafiz_id = 1 AND revisions.mode_id = 4 AND revisions.item_id IN (
+            SELECT item_id FROM hafizs_items
+            WHERE (mode_id = 4 OR watch_list_graduation_date IS NOT NULL) AND hafiz_id = 1
+        )
+        ORDER BY revisions.item_id, revisions.revision_date, revisions.id
+    """,
+    "query_srs_table (eligible)": """
+        SELECT hafizs_items.item_id, pages.page_number, surahs.name, hafizs_items.last_review AS last_review_date
+        FROM hafizs_items
+        LEFT JOIN items ON hafizs_items.item_id = items.id
+        LEFT JOIN pages ON items.page_id = pages.id
+        LEFT JOIN surahs ON items.surah_id = surahs.id
+        WHERE hafizs_items.hafiz_id = 1 AND hafizs_items.mode_id <> 5 AND hafizs_items.status IS NOT NULL
+        AND hafizs_items.bad_streak > 0
+        ORDER BY last_review_date DESC, pages.page_number ASC, hafizs_items.item_id ASC
+        LIMIT 50 OFFSET 0
+    """,
+    "query_srs_table (current)": """
+        SELECT hafizs_items.item_id, pages.page_number, hafizs_items.next_review,
+        COALESCE(CAST(julianday('2025-01-01') - julianday(hafizs_items.next_review) AS INTEGER), -1) AS due
+        FROM hafizs_items
+        LEFT JOIN items ON hafizs_items.item_id = items.id
+        LEFT JOIN pages ON items.page_id = pages.id
+        LEFT JOIN surahs ON items.surah_id = surahs.id
+        WHERE hafizs_items.hafiz_id = 1 AND hafizs_items.mode_id = 5
+        ORDER BY due DESC, hafizs_items.next_review DESC, pages.page_number ASC, hafizs_items.item_id ASC
+        LIMIT 50 OFFSET 0
+    """,
+}
+
+WATCHED_TABLES = ("revisions", "hafizs_items", "daily_progress")
+
+
+def is_full_scan(detail: str) -> bool:
+    """`SCAN <table>` without an index is a full table scan"""
+    words = detail.split()
+    return (
+        len(words) >= 2
+        and words[0] == "SCAN"
+        and words[1] in WATCHED_TABLES
+        and "INDEX" not in words
+    )
+
+
+def get_stale_queries(source_path=MAIN_PATH):
+    """The QUERIES whose function is no longer defined in main.py"""
+    with open(source_path) as f:
+        functions = {
+            node.name
+            for node in ast.walk(ast.parse(f.read()))
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+    return [name for name in QUERIES if name.split(" (")[0] not in functions]
+
+
+def check_query_plans(db_path):
+    conn = sqlite3.connect(db_path)
+    flagged = []
+    for name, qry in QUERIES.items():
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {qry}").fetchall()
+        details = [row[-1] for row in plan]
+        status = "FULL SCAN" if any(map(is_full_scan, details)) else "ok"
+        if status != "ok":
+            flagged.append(name)
+        print(f"[{status}] {name}")
+        for detail in details:
+            print(f"    {detail}")
+    conn.close()
+    return flagged
+
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    stale = get_stale_queries()
+    if stale:
+        print(f"{len(stale)} queries are of functions no longer in main.py: {', '.join(stale)}")
+        sys.exit(1)
+    flagged = check_query_plans(db_path)
+    if flagged:
+        print(f"\n{len(flagged)} queries still do a full scan: {', '.join(flagged)}")
+        sys.exit(1)
+    print("\nAll queries use an index")
@@ -3,10 +3,25 @@ import fasthtml.common as fh
 from monsterui.all import *
 from utils import *
 import pandas as pd
-from io import BytesIO
+import numpy as np
+from io import BytesIO, StringIO, TextIOWrapper
 from collections import defaultdict
 import time
+import json
+import csv
+import zlib
+from itertools import batched
+from types import MappingProxyType
+from typing import get_args
 from datetime import datetime
+from contextvars import ContextVar
+from contextlib import contextmanager
+import threading
+import traceback
+import secrets
+import shutil
+import tempfile
+from urllib.parse import urlencode
 
 RATING_MAP = {"1": "✅ Good", "0": "😄 Ok", "-1": "❌ Bad"}
 OPTION_MAP = {
@@ -23,8 +38,185 @@ DB_PATH = "data/quran_v9.db"
 # This function will handle table creation and migration using fastmigrate
 create_and_migrate_db(DB_PATH)
 
-db = database(DB_PATH)
-tables = db.t
+######## Connection Pool ########
+# Page cache (in KiB) and mmap size (in bytes) of each connection
+DB_CACHE_SIZE_KIB = int(os.environ.get("DB_CACHE_SIZE_KIB", 64 * 1024))
+DB_MMAP_SIZE = int(os.environ.get("DB_MMAP_SIZE", 256 * 1024 * 1024))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", 5000))
+
+# Set in `before`, GET requests are served from the read-only pool
+read_only_request = ContextVar("read_only_request", default=False)
+
+# GET routes that write to the database, they are served from the read-write pool
+WRITING_GET_ROUTES = [
+    "/close_date",
+    "/start-srs/.*",
+    "/update_stats_column",
+]
+
+
+class ConnectionPool:
+    """
+    One connection per thread to the database, opened lazily with the tuned PRAGMAs.
+
+    WAL lets the readers run while a writer holds the lock, and the busy timeout makes
+    concurrent writers wait for each other instead of failing with `database is locked`.
+    """
+
+    def __init__(self, path, read_only=False):
+        self.path = path
+        self.read_only = read_only
+        self.local = threading.local()
+
+    def open(self):
+        conn = database(self.path)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+        if self.read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.open()
+        return conn
+
+
+class PooledDatabase:
+    """
+    Stand-in for the fastlite database: every access resolves to the connection of the current thread,
+    from the read-only pool while serving a GET request.
+    """
+
+    def __init__(self, path):
+        self.read_write = ConnectionPool(path)
+        self.read_only = ConnectionPool(path, read_only=True)
+
+    def current(self):
+        pool = self.read_only if read_only_request.get() else self.read_write
+        return pool.connection()
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+
+class PooledTable:
+    """Stand-in for a table: every access resolves to the table of the current thread's connection"""
+
+    # table name -> dataclass, shared by the tables of all the connections
+    classes = {}
+
+    def __init__(self, name):
+        self.name = name
+
+    def current(self):
+        table = db.table(self.name)
+        if self.name in self.classes:
+            table.cls = self.classes[self.name]
+        return table
+
+    def dataclass(self):
+        cls = self.classes[self.name] = self.current().dataclass()
+        return cls
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.current()(*args, **kwargs)
+
+    def __getitem__(self, pk_values):
+        return self.current()[pk_values]
+
+    # To be used in the SQL f-strings like the table objects
+    def __str__(self):
+        return self.name
+
+
+class PooledTables:
+    """`db.t` for the pooled database"""
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        if name in HAFIZ_SCOPED_TABLES:
+            return HafizScopedTable(name)
+        return PooledTable(name)
+
+    def __dir__(self):
+        return db.table_names()
+
+    def __repr__(self):
+        return ", ".join(dir(self))
+
+
+db = PooledDatabase(DB_PATH)
+tables = PooledTables()
+
+
+@contextmanager
+def writable():
+    """Write from a read-only request (eg: lazily created records) through the read-write pool"""
+    token = read_only_request.set(False)
+    try:
+        yield
+    finally:
+        read_only_request.reset(token)
+
+
+######## END ########
+
+
+######## Hafiz Scope ########
+# The hafiz owned tables are bound to the hafiz of the current request through a ContextVar,
+# instead of calling `xtra(hafiz_id=...)` on the shared table objects, so that concurrent
+# requests of different hafizs (threads or workers) never see each other's filter.
+current_hafiz_id = ContextVar("current_hafiz_id", default=None)
+HAFIZ_SCOPED_TABLES = ("revisions", "hafizs_items")
+
+
+class HafizScopedTable(PooledTable):
+    """
+    Stand-in for a hafiz owned table (`revisions`, `hafizs_items`).
+
+    Every access resolves to a table filtered on the current hafiz (see `hafiz_scope`),
+    or to the unfiltered table outside of a hafiz scope.
+    """
+
+    def current(self):
+        table = super().current()
+        hafiz_id = current_hafiz_id.get()
+        if hafiz_id is None:
+            return table
+        # Fresh table object (own `xtra` and `last_rowid`),
+        # as `db.table(name)` returns the same cached object for a name
+        bound = type(table)(table.db, self.name)
+        if self.name in self.classes:
+            bound.cls = self.classes[self.name]
+        bound.xtra(hafiz_id=hafiz_id)
+        return bound
+
+
+@contextmanager
+def hafiz_scope(hafiz_id):
+    """Bind the hafiz owned tables to the `hafiz_id` (eg: for scripts and background jobs)"""
+    token = current_hafiz_id.set(hafiz_id)
+    try:
+        yield
+    finally:
+        current_hafiz_id.reset(token)
+
+
+######## END ########
+
+
 (
     revisions,
     hafizs,
@@ -87,15 +279,19 @@ alpinejs_header = Script(
 )
 
 
-def before(req, sess):
+# async, so that the hafiz scope is set in the request's context (sync handlers run with a copy of it)
+async def before(req, sess):
     user_auth = req.scope["user_auth"] = sess.get("user_auth", None)
     if not user_auth:
         return RedirectResponse("/login", status_code=303)
     auth = req.scope["auth"] = sess.get("auth", None)
     if not auth:
         return RedirectResponse("/hafiz_selection", status_code=303)
-    revisions.xtra(hafiz_id=auth)
-    hafizs_items.xtra(hafiz_id=auth)
+    current_hafiz_id.set(auth)
+    read_only_request.set(
+        req.method == "GET"
+        and not any(re.fullmatch(r, req.url.path) for r in WRITING_GET_ROUTES)
+    )
 
 
 bware = Beforeware(before, skip=["/hafiz_selection", "/login", "/logout", "/add_hafiz"])
@@ -107,6 +303,90 @@ app, rt = fast_app(
 )
 
 
+def replay_srs_revisions(
+    rev_data: list[dict],
+    intervals: list,
+    start_interval: int,
+    end_interval: int,
+    srs_start_date: str,
+    current_date: str,
+    positions: dict = None,
+):
+    """
+    Replay the ratings of the SRS revisions (ordered by revision_date) as position moves on the booster pack's intervals.
+
+    "good": move forward, "ok": stay at the same position, "bad": move backward.
+    The replay stops at the revision that causes graduation (next interval beyond the end_interval).
+
+    Returns:
+        tuple: `(last_interval, current_interval, next_interval, id)` rows for the revisions
+        and the interval columns for the hafizs_items.
+    """
+    # If no records, reset to initial state (Either deleted all records or not even started)
+    if not rev_data:
+        return [], {
+            "last_review": None,
+            "last_interval": None,
+            "current_interval": calculate_days_difference(srs_start_date, current_date),
+            "next_interval": start_interval,
+            "next_review": add_days_to_date(srs_start_date, start_interval),
+        }
+
+    if positions is None:
+        positions = get_interval_positions(intervals)
+    revision_updates = []
+    previous_date = srs_start_date
+    next_interval = start_interval
+
+    for rev in rev_data:
+        last_interval = next_interval
+        current_interval = calculate_days_difference(previous_date, rev["revision_date"])
+        next_interval = get_interval_triplet_by_position(
+            current_interval=last_interval, interval_list=intervals, positions=positions
+        )[rev["rating"] + 1]
+
+        # This revision caused graduation
+        is_graduated = next_interval == "Finished" or next_interval > end_interval
+        if is_graduated:
+            next_interval = None
+
+        revision_updates.append(
+            (last_interval, current_interval, next_interval, rev["id"])
+        )
+        previous_date = rev["revision_date"]
+        if is_graduated:
+            break
+
+    return revision_updates, {
+        "last_review": previous_date,
+        "last_interval": last_interval,
+        "current_interval": calculate_days_difference(previous_date, current_date),
+        "next_interval": next_interval,
+        "next_review": (
+            add_days_to_date(previous_date, next_interval) if next_interval else None
+        ),
+    }
+
+
+def save_srs_replay(revision_updates: list[tuple], hafiz_items_updates: list[dict]):
+    """Write the replayed intervals of the revisions and the hafizs_items (with the `id` key) in one transaction"""
+    with db.conn:
+        db.conn.executemany(
+            "UPDATE revisions SET last_interval = ?, current_interval = ?, next_interval = ? WHERE id = ?",
+            revision_updates,
+        )
+        # last_review is kept as it is, when there are no revisions to replay
+        db.conn.executemany(
+            """
+            UPDATE hafizs_items SET last_review = COALESCE(:last_review, last_review),
+            last_interval = :last_interval, current_interval = :current_interval,
+            next_interval = :next_interval, next_review = :next_review
+            WHERE id = :id
+            """,
+            hafiz_items_updates,
+        )
+
+
 def recalculate_intervals_on_srs_records(item_id: int, current_date: str):
     """
     Recalculates SRS (Spaced Repetition System) intervals for a specific item based on its revision history.
@@ -116,198 +396,229 @@ def recalculate_intervals_on_srs_records(item_id: int, current_date: str):
         current_date (str): The current date used for interval calculations.
 
     Returns:
-        None: Updates the item's SRS intervals in the database, or returns None if no revision records exist.
-
-    Notes:
-        - Handles initial state when no revision records are found
-        - Calculates intervals based on previous revision dates and ratings
-        - Updates item's next review interval and date dynamically
+        None: Updates the item's SRS intervals in the database.
     """
     hafiz_item_details = get_hafizs_items(item_id)
     srs_start_date = hafiz_item_details.srs_start_date
+    ladder = get_booster_pack_ladder(hafiz_item_details.srs_booster_pack_id)
+
+    rev_data = db.q(
+        f"""
+        SELECT id, revision_date, rating FROM revisions
+        WHERE hafiz_id = {hafiz_item_details.hafiz_id} AND item_id = {item_id} AND mode_id = 5
+        AND revision_date >= '{srs_start_date}'
+        ORDER BY revision_date ASC, id ASC
+        """
+    )
+    revision_updates, hafiz_item_update = replay_srs_revisions(
+        rev_data=rev_data,
+        intervals=ladder.intervals,
+        start_interval=ladder.start_interval,
+        end_interval=ladder.end_interval,
+        srs_start_date=srs_start_date,
+        current_date=current_date,
+        positions=ladder.positions,
+    )
+    save_srs_replay(revision_updates, [hafiz_item_update | {"id": hafiz_item_details.id}])
 
-    # Here we are taking the start_interval
-    # as we want the start_interval as the starting point, when looping through all the records
-    booster_id = hafiz_item_details.srs_booster_pack_id
-    srs_pack_details = srs_booster_pack[booster_id]
-    start_interval = srs_pack_details.start_interval
-    end_interval = srs_pack_details.end_interval
 
-    items_rev_data = revisions(
-        where=f"item_id = {item_id} AND mode_id = 5 AND revision_date >= '{srs_start_date}'",
-        order_by="revision_date ASC",
-    )
+def recalculate_all_srs_intervals(hafiz_id: int = None, booster_pack_id: int = None):
+    """
+    Recalculates the intervals of every SRS item in a single pass (eg: after a booster pack change).
 
-    # If no records, reset to initial state (Either deleted all records or not even started)
-    if not items_rev_data:
-        hafiz_item_details.next_interval = start_interval
-        hafiz_item_details.next_review = add_days_to_date(
-            srs_start_date, start_interval
-        )
-        hafiz_item_details.last_interval = None
-        hafiz_item_details.current_interval = calculate_days_difference(
-            srs_start_date, current_date
-        )
-        hafizs_items.update(hafiz_item_details)
-        return None
+    Args:
+        hafiz_id (int, optional): Only the SRS items of this hafiz. If None, all the hafizs.
+        booster_pack_id (int, optional): Only the SRS items using this booster pack.
 
-    intervals = get_srs_interval_list(item_id)
-    previous_date = srs_start_date
-    current_interval_position = start_interval
+    Each hafiz's own current_date is used for the current_interval.
+    """
+    conditions = [
+        "hafizs_items.mode_id = 5",
+        "hafizs_items.srs_start_date IS NOT NULL",
+        "hafizs_items.srs_booster_pack_id IS NOT NULL",
+    ]
+    if hafiz_id is not None:
+        conditions.append(f"hafizs_items.hafiz_id = {hafiz_id}")
+    if booster_pack_id is not None:
+        conditions.append(f"hafizs_items.srs_booster_pack_id = {booster_pack_id}")
+    condition = " AND ".join(conditions)
+
+    srs_items = db.q(
+        f"""
+        SELECT hafizs_items.id, hafizs_items.hafiz_id, hafizs_items.item_id,
+        hafizs_items.srs_start_date, hafizs_items.srs_booster_pack_id, hafizs.current_date
+        FROM hafizs_items
+        JOIN hafizs ON hafizs_items.hafiz_id = hafizs.id
+        WHERE {condition}
+        """
+    )
+    if not srs_items:
+        return None
 
-    for rev in items_rev_data:
-        current_revision_date = rev.revision_date
-        current_interval = calculate_days_difference(
-            previous_date, current_revision_date
+    rev_data = db.q(
+        f"""
+        SELECT revisions.id, revisions.hafiz_id, revisions.item_id, revisions.revision_date, revisions.rating
+        FROM revisions
+        JOIN hafizs_items ON revisions.hafiz_id = hafizs_items.hafiz_id AND revisions.item_id = hafizs_items.item_id
+        WHERE {condition} AND revisions.mode_id = 5 AND revisions.revision_date >= hafizs_items.srs_start_date
+        ORDER BY revisions.revision_date ASC, revisions.id ASC
+        """
+    )
+    grouped_rev_data = defaultdict(list)
+    for rev in rev_data:
+        grouped_rev_data[(rev["hafiz_id"], rev["item_id"])].append(rev)
+
+    revision_updates = []
+    hafiz_items_updates = []
+    for srs_item in srs_items:
+        ladder = get_booster_pack_ladder(srs_item["srs_booster_pack_id"])
+        item_revision_updates, hafiz_item_update = replay_srs_revisions(
+            rev_data=grouped_rev_data[(srs_item["hafiz_id"], srs_item["item_id"])],
+            intervals=ladder.intervals,
+            start_interval=ladder.start_interval,
+            end_interval=ladder.end_interval,
+            srs_start_date=srs_item["srs_start_date"],
+            current_date=srs_item["current_date"],
+            positions=ladder.positions,
         )
-        last_interval = current_interval_position
+        revision_updates.extend(item_revision_updates)
+        hafiz_items_updates.append(hafiz_item_update | {"id": srs_item["id"]})
 
-        # This is get the previous and next interval based in the `last_interval` -> [1,2,3] the middle one is the `last_interval`
-        # "good": move forward in sequence
-        # "ok": stay at same position
-        # "bad": move backward in sequence
-        rating_intervals = get_interval_triplet(
-            current_interval=last_interval, interval_list=intervals
-        )
-        calculated_next_interval = rating_intervals[rev.rating + 1]
+    save_srs_replay(revision_updates, hafiz_items_updates)
 
-        if calculated_next_interval > end_interval:
-            # This revision caused graduation
-            next_interval = None
 
-            data_to_update = {
-                "last_interval": last_interval,
-                "current_interval": current_interval,
-                "next_interval": next_interval,
-            }
-            revisions.update(data_to_update, rev.id)
-
-            # Update hafizs_items for graduation
-            final_data = {
-                "last_review": current_revision_date,
-                "last_interval": last_interval,
-                "current_interval": calculate_days_difference(
-                    current_revision_date, current_date
-                ),
-                "next_interval": next_interval,
-                "next_review": None,
-            }
-            hafizs_items.update(final_data, hafiz_item_details.id)
-            break  # Exit - no more processing needed
-        else:
-            # Normal progression
-            next_interval = calculated_next_interval
+STAT_COLUMNS_DEFAULT = {
+    "good_streak": 0,
+    "bad_streak": 0,
+    "last_review": "",
+    "good_count": 0,
+    "bad_count": 0,
+    "score": 0,
+    "count": 0,
+}
 
-            data_to_update = {
-                "last_interval": last_interval,
-                "current_interval": current_interval,
-                "next_interval": next_interval,
-            }
-            revisions.update(data_to_update, rev.id)
-
-            # Handle final revision if this is the last one
-            if rev.id == items_rev_data[-1].id:
-                final_data = {
-                    "last_review": current_revision_date,
-                    "last_interval": last_interval,
-                    "current_interval": calculate_days_difference(
-                        current_revision_date, current_date
-                    ),
-                    "next_interval": next_interval,
-                    "next_review": add_days_to_date(
-                        current_revision_date, next_interval
-                    ),
-                }
-                hafizs_items.update(final_data, hafiz_item_details.id)
-                break
 
-        # Prepare for the next iteration
-        previous_date = current_revision_date
-        current_interval_position = next_interval  # (for next iteration)
+def get_revision_stats_query(condition: str) -> str:
+    """
+    Compute the stat columns for each (hafiz_id, item_id) of the revisions matching the `condition`
+    in a single ordered scan, using window functions.
+
+    The streak is the length of the trailing run of the same rating (only counted for good/bad ratings)
+    """
+    return f"""
+        WITH ordered AS (
+            SELECT hafiz_id, item_id, rating, revision_date,
+            ROW_NUMBER() OVER win AS rn,
+            FIRST_VALUE(rating) OVER win AS last_rating
+            FROM revisions
+            WHERE {condition}
+            WINDOW win AS (PARTITION BY hafiz_id, item_id ORDER BY revision_date DESC, id DESC)
+        ),
+        summary AS (
+            SELECT hafiz_id, item_id, last_rating,
+            MAX(CASE WHEN rn = 1 THEN revision_date END) AS last_review,
+            SUM(rating = 1) AS good_count,
+            SUM(rating = -1) AS bad_count,
+            SUM(rating) AS score,
+            COUNT(*) AS count,
+            COALESCE(MIN(CASE WHEN rating IS NOT last_rating THEN rn END), COUNT(*) + 1) - 1 AS streak
+            FROM ordered
+            GROUP BY hafiz_id, item_id
+        )
+        SELECT hafiz_id, item_id,
+        CASE WHEN last_rating = 1 THEN streak ELSE 0 END AS good_streak,
+        CASE WHEN last_rating = -1 THEN streak ELSE 0 END AS bad_streak,
+        last_review, good_count, bad_count, score, count
+        FROM summary
+    """
 
 
 def populate_hafizs_items_stat_columns(
-    item_id: int = None,
-    # current_date: str,
-    # update_srs: bool = True,
+    item_id: int = None, hafiz_id: int = None, item_ids: list = None
 ):
     """
-    Populate or update statistics columns for Hafiz items in the memorization tracking system.
-
-    This function calculates and updates various review-related statistics for memorization items,
-    including good/bad review streaks, review counts, and overall review score. It can update
-    statistics for a specific item or all items in the hafizs_items table.
+    Recompute the stats columns (good/bad streaks, counts, score and last_review) of the hafizs_items
+    from their revisions.
 
     Args:
-        current_date (str): The current date used for interval calculations.
-        item_id (int, optional): Specific item ID to update. If None, updates all items.
-        update_srs (bool, optional): Whether to recalculate SRS intervals. Defaults to True.
-
-    Returns:
-        None: Updates hafizs_items table directly with calculated statistics.
+        item_id (int, optional): Recompute only this item of the current hafiz (used after edit/delete of a revision).
+        hafiz_id (int, optional): Restrict the bulk rebuild to this hafiz. If both are None, rebuilds all the items.
+        item_ids (list, optional): Restrict the bulk rebuild to these items.
 
-    The function performs the following key operations:
-    - Computes consecutive good and bad review streaks
-    - Tracks total good and bad review counts
-    - Calculates cumulative review score
-    - Optionally updates Spaced Repetition System (SRS) intervals
+    For a newly inserted revision use `apply_revision_stats_delta` instead, which doesn't rescan the history.
     """
+    # Recompute the stats for a specific item if item_id is givien
+    if item_id is not None:
+        current_hafiz_items = hafizs_items(where=f"item_id = {item_id}")
+        if not current_hafiz_items:
+            return None
+        current_hafiz_item = current_hafiz_items[0]
+        stats = db.q(
+            get_revision_stats_query(
+                f"hafiz_id = {current_hafiz_item.hafiz_id} AND item_id = {item_id}"
+            )
+        )
+        item_stats = (
+            {k: stats[0][k] for k in STAT_COLUMNS_DEFAULT}
+            if stats
+            else STAT_COLUMNS_DEFAULT
+        )
+        hafizs_items.update(item_stats, current_hafiz_item.id)
+        return None
 
-    def get_item_id_summary(item_id: int):
-        items_rev_data = revisions(
-            where=f"item_id = {item_id}", order_by="revision_date ASC"
+    # Bulk rebuild of all the items with two set based updates
+    condition = f"hafiz_id = {hafiz_id}" if hafiz_id is not None else "1 = 1"
+    if item_ids is not None:
+        condition += f" AND item_id IN ({', '.join(map(str, item_ids))})"
+    set_default = ", ".join(f"{k} = ?" for k in STAT_COLUMNS_DEFAULT)
+    set_stats = ", ".join(f"{k} = stats.{k}" for k in STAT_COLUMNS_DEFAULT)
+    with db.conn:
+        db.execute(
+            f"UPDATE hafizs_items SET {set_default} WHERE {condition}",
+            list(STAT_COLUMNS_DEFAULT.values()),
+        )
+        db.execute(
+            f"""
+            UPDATE hafizs_items SET {set_stats}
+            FROM ({get_revision_stats_query(condition)}) AS stats
+            WHERE hafizs_items.hafiz_id = stats.hafiz_id AND hafizs_items.item_id = stats.item_id
+            """
         )
-        good_streak = 0
-        bad_streak = 0
-        last_review = ""
-        good_count = 0
-        bad_count = 0
-        score = 0
-        count = 0
 
-        for rev in items_rev_data:
-            current_rating = rev.rating
-
-            if current_rating == -1:
-                bad_count += 1
-                # Update the streak
-                bad_streak += 1
-                good_streak = 0
-            elif current_rating == 1:
-                good_count += 1
-                # Update the streak
-                good_streak += 1
-                bad_streak = 0
-            else:
-                good_streak = 0
-                bad_streak = 0
-
-            score += current_rating
-            count += 1
-            last_review = rev.revision_date
-
-        return {
-            "good_streak": good_streak,
-            "bad_streak": bad_streak,
-            "last_review": last_review,
-            "good_count": good_count,
-            "bad_count": bad_count,
-            "score": score,
-            "count": count,
-        }
 
-    # Update the streak for a specific items if item_id is givien
-    if item_id is not None:
-        current_hafiz_items = hafizs_items(where=f"item_id = {item_id}")
-        if current_hafiz_items:
-            current_hafiz_items_id = current_hafiz_items[0].id
-            hafizs_items.update(get_item_id_summary(item_id), current_hafiz_items_id)
+def apply_revision_stats_delta(revision: Revision):
+    """
+    Update the stats columns for a newly inserted revision in O(1) from the stored stats.
 
+    Falls back to recomputing the item, if the stats are not populated yet or
+    the revision is back dated (there are revisions after it).
+    """
+    item_id = revision.item_id
+    current_hafiz_items = hafizs_items(where=f"item_id = {item_id}")
+    if not current_hafiz_items:
+        return None
+    current = current_hafiz_items[0]
+    later_revisions = revisions(
+        where=f"item_id = {item_id} AND revision_date > '{revision.revision_date}'",
+        limit=1,
+    )
+    if current.count is None or later_revisions:
+        populate_hafizs_items_stat_columns(item_id=item_id)
         return None
 
-    # Update the streak for all the items in the hafizs_items
-    for h_item in hafizs_items():
-        hafizs_items.update(get_item_id_summary(h_item.item_id), h_item.id)
+    rating = revision.rating
+    hafizs_items.update(
+        {
+            "good_streak": (current.good_streak or 0) + 1 if rating == 1 else 0,
+            "bad_streak": (current.bad_streak or 0) + 1 if rating == -1 else 0,
+            "last_review": revision.revision_date,
+            "good_count": (current.good_count or 0) + (rating == 1),
+            "bad_count": (current.bad_count or 0) + (rating == -1),
+            "score": (current.score or 0) + rating,
+            "count": current.count + 1,
+        },
+        current.id,
+    )
 
 
 # This function is responsible for updating the hafizs_items stats column and interval column(if needed)
@@ -336,14 +647,15 @@ def get_item_id(page_number: int, not_memorized_only: bool = False):
 
     if not hafiz_data:
         page_items = items(where=f"page_id = {page_number} AND active = 1")
-        for item in page_items:
-            hafizs_items.insert(
-                Hafiz_Items(
-                    item_id=item.id,
-                    page_number=item.page_id,
-                    mode_id=1,
+        with writable():
+            for item in page_items:
+                hafizs_items.insert(
+                    Hafiz_Items(
+                        item_id=item.id,
+                        page_number=item.page_id,
+                        mode_id=1,
+                    )
                 )
-            )
     hafiz_data = (
         hafizs_items(
             where=f"{qry} AND status IS NULL"
@@ -371,7 +683,10 @@ def get_current_date(auth) -> str:
     current_hafiz = hafizs[auth]
     current_date = current_hafiz.current_date
     if current_date is None:
-        current_date = hafizs.update(current_date=current_time(), id=auth).current_date
+        with writable():
+            current_date = hafizs.update(
+                current_date=current_time(), id=auth
+            ).current_date
     return current_date
 
 
@@ -387,38 +702,233 @@ def get_column_headers(table):
     return columns
 
 
+######## Metadata Cache ########
+# These tables almost never change, so they are loaded once per process into {id: record} dicts.
+# The cache is invalidated when a table is edited through the `/tables` admin or CSV import.
+# NOTE: The cached records are shared, so don't mutate them.
+METADATA_TABLES = ["mushafs", "surahs", "pages", "items", "modes", "srs_booster_pack"]
+metadata_cache = {}
+
+
+def get_metadata(table: str) -> dict:
+    """Returns the records of the metadata table as {id: record}"""
+    records = metadata_cache.get(table)
+    if records is None:
+        records = metadata_cache[table] = {r.id: r for r in tables[table]()}
+    return records
+
+
+def get_active_item_ids() -> list:
+    """Sorted ids of the active items"""
+    item_ids = metadata_cache.get("active_item_ids")
+    if item_ids is None:
+        item_ids = metadata_cache["active_item_ids"] = sorted(
+            item.id for item in get_metadata("items").values() if item.active == 1
+        )
+    return item_ids
+
+
+def get_page_items(page_id: int) -> list:
+    """Items (including the inactive ones) of a page, ordered by id"""
+    page_items = metadata_cache.get("page_items")
+    if page_items is None:
+        page_items = defaultdict(list)
+        for item in sorted(get_metadata("items").values(), key=lambda i: i.id):
+            page_items[item.page_id].append(item)
+        metadata_cache["page_items"] = page_items
+    return page_items.get(page_id, [])
+
+
+def get_page_weights() -> np.ndarray:
+    """
+    Page weight of each item indexed by item_id, 1 for a full page and 1/n for a part of a page with n active parts.
+    (inactive items on a page without active parts are 0)
+    """
+    weights = metadata_cache.get("page_weights")
+    if weights is None:
+        all_items = get_metadata("items")
+        weights = np.zeros(max(all_items, default=0) + 1)
+        for item in all_items.values():
+            active_parts = sum(1 for i in get_page_items(item.page_id) if i.active == 1)
+            if active_parts:
+                weights[item.id] = 1 / active_parts
+        metadata_cache["page_weights"] = weights
+    return weights
+
+
+@dataclass(frozen=True)
+class BoosterPackLadder:
+    """The intervals of a booster pack, parsed once, with the position of each interval"""
+
+    intervals: tuple
+    # interval -> position in `intervals`
+    positions: MappingProxyType
+    start_interval: int
+    end_interval: int
+
+    def triplet(self, current_interval) -> list:
+        """[bad, ok, good] next intervals from the current_interval"""
+        return get_interval_triplet_by_position(
+            current_interval, self.intervals, self.positions
+        )
+
+    def rating_intervals(self, current_interval, is_dropdown: bool = False) -> dict:
+        """rating -> next interval, "Finished" (for the dropdown) when it is beyond the end_interval"""
+        intervals = dict(zip((-1, 0, 1), self.triplet(current_interval)))
+        if is_dropdown:
+            return {
+                rating: (
+                    "Finished"
+                    if interval == "Finished" or interval > self.end_interval
+                    else interval
+                )
+                for rating, interval in intervals.items()
+            }
+        return intervals
+
+
+def get_booster_pack_ladder(booster_pack_id: int) -> BoosterPackLadder:
+    ladders = metadata_cache.get("booster_pack_ladders")
+    if ladders is None:
+        ladders = {}
+        for pack in get_metadata("srs_booster_pack").values():
+            intervals = tuple(parse_srs_interval_list(pack.interval_days, pack.end_interval))
+            ladders[pack.id] = BoosterPackLadder(
+                intervals=intervals,
+                positions=MappingProxyType(get_interval_positions(intervals)),
+                start_interval=pack.start_interval,
+                end_interval=pack.end_interval,
+            )
+        metadata_cache["booster_pack_ladders"] = ladders
+    return ladders[booster_pack_id]
+
+
+def invalidate_metadata(table: str = None):
+    """Drop the cached records of the table (or all the tables), so they are reloaded on the next access"""
+    if table is None:
+        metadata_cache.clear()
+    elif table in METADATA_TABLES:
+        metadata_cache.pop(table, None)
+        if table == "items":
+            metadata_cache.pop("active_item_ids", None)
+            metadata_cache.pop("page_items", None)
+            metadata_cache.pop("page_weights", None)
+        if table == "srs_booster_pack":
+            metadata_cache.pop("booster_pack_ladders", None)
+
+
+######## END ########
+
+
+######## Daily Progress ########
+# `daily_progress` holds the page count and the ids of the revisions per (hafiz, date, mode).
+# It is kept up to date by triggers on the revisions table (see migrations/0013-create-daily-progress.sql),
+# so every write path (bulk adds, table edits, imports) is covered.
+
+
+def get_daily_progress(hafiz_id: int, start_date: str, end_date: str) -> dict:
+    """(revision_date, mode_id) -> daily_progress row (with `revision_ids` as a list) of the date range"""
+    qry = f"""
+        SELECT revision_date, mode_id, page_count, revision_count, revision_ids FROM daily_progress
+        WHERE hafiz_id = {hafiz_id} AND revision_date BETWEEN '{start_date}' AND '{end_date}'
+    """
+    return {
+        (r["revision_date"], r["mode_id"]): r | {"revision_ids": json.loads(r["revision_ids"])}
+        for r in db.q(qry)
+    }
+
+
+# The page weight of an item only depends on these columns (of the items on its page)
+ITEM_WEIGHT_COLUMNS = ("active", "page_id", "part")
+
+
+def get_item_weight_keys(item_ids: list = None) -> dict:
+    """item_id -> (active, page_id, part) of the `item_ids` (or all the items)"""
+    params = list(item_ids) if item_ids is not None else []
+    condition = f"id IN ({', '.join('?' for _ in params)})" if item_ids is not None else "1 = 1"
+    qry = f"SELECT id, {', '.join(ITEM_WEIGHT_COLUMNS)} FROM items WHERE {condition}"
+    return {r["id"]: tuple(r[c] for c in ITEM_WEIGHT_COLUMNS) for r in db.q(qry, params)}
+
+
+def rebuild_daily_progress(before: dict, after: dict):
+    """
+    Recompute the daily progress rows holding a revision of an item whose page weight changed,
+    between the `before` and `after` `get_item_weight_keys` of a write to the items.
+    An item changes the weights of all the items on its (old and new) page.
+    """
+    changed = [i for i in before.keys() | after.keys() if before.get(i) != after.get(i)]
+    if not changed:
+        return
+    # items.page_id is nullable, an item without a page only affects itself
+    page_ids = {
+        keys[1]
+        for keys in [*map(before.get, changed), *map(after.get, changed)]
+        if keys and keys[1] is not None
+    }
+    page_condition = (
+        f"OR item_id IN (SELECT id FROM items WHERE page_id IN ({', '.join('?' for _ in page_ids)}))"
+        if page_ids
+        else ""
+    )
+    affected = f"""
+        SELECT DISTINCT hafiz_id, revision_date, mode_id FROM revisions
+        WHERE item_id IN ({", ".join("?" for _ in changed)}) {page_condition}
+    """
+    params = [*changed, *page_ids]
+    with db.conn:
+        db.execute(
+            f"DELETE FROM daily_progress WHERE (hafiz_id, revision_date, mode_id) IN ({affected})",
+            params,
+        )
+        db.execute(
+            f"""
+            INSERT INTO daily_progress (hafiz_id, revision_date, mode_id, page_count, revision_count, revision_ids)
+            SELECT revisions.hafiz_id, revisions.revision_date, revisions.mode_id,
+            SUM(COALESCE(item_page_weights.weight, 0)), COUNT(*), json_group_array(revisions.id)
+            FROM revisions
+            LEFT JOIN item_page_weights ON revisions.item_id = item_page_weights.item_id
+            WHERE (revisions.hafiz_id, revisions.revision_date, revisions.mode_id) IN ({affected})
+            GROUP BY revisions.hafiz_id, revisions.revision_date, revisions.mode_id
+            """,
+            params,
+        )
+
+
+######## END ########
+
+
 def get_mode_name(mode_id: int):
-    return modes[mode_id].name
+    return get_metadata("modes")[mode_id].name
 
 
 def get_juz_name(page_id=None, item_id=None):
     if item_id:
-        qry = f"SELECT pages.juz_number FROM pages LEFT JOIN items ON pages.id = items.page_id WHERE items.id = {item_id}"
-        juz_number = db.q(qry)[0]["juz_number"]
+        page_id = get_metadata("items")[item_id].page_id
+        juz_number = get_metadata("pages")[page_id].juz_number
     else:
-        juz_number = pages[page_id].juz_number
+        juz_number = get_metadata("pages")[page_id].juz_number
     return juz_number
 
 
 def get_surah_name(page_id=None, item_id=None):
     if item_id:
-        surah_id = items[item_id].surah_id
+        surah_id = get_metadata("items")[item_id].surah_id
     else:
-        surah_id = items(where=f"page_id = {page_id}")[0].surah_id
-    surah_details = surahs[surah_id]
+        surah_id = get_page_items(page_id)[0].surah_id
+    surah_details = get_metadata("surahs")[surah_id]
     return surah_details.name
 
 
 def get_start_text(item_id):
     try:
-        return items[item_id].start_text
+        return get_metadata("items")[int(item_id)].start_text
     except:
         return "-"
 
 
 def get_page_number(item_id):
-    page_id = items[item_id].page_id
-    return pages[page_id].page_number
+    page_id = get_metadata("items")[int(item_id)].page_id
+    return get_metadata("pages")[page_id].page_number
 
 
 def get_page_description(
@@ -428,11 +938,38 @@ def get_page_description(
     is_bold: bool = True,
     custom_text="",
 ):
-    item_description = items[item_id].description
+    item_description = get_metadata("items")[int(item_id)].description
+    if not item_description:
+        return render_page_description(
+            item_id,
+            page_number=get_page_number(item_id),
+            surah_name=get_surah_name(item_id=item_id),
+            link=link,
+            is_link=is_link,
+            is_bold=is_bold,
+            custom_text=custom_text,
+        )
+    return render_page_description(
+        item_id, description=item_description, link=link, is_link=is_link
+    )
+
+
+def render_page_description(
+    item_id,
+    description: str = None,
+    page_number: int = None,
+    surah_name: str = None,
+    link: str = None,
+    is_link: bool = True,
+    is_bold: bool = True,
+    custom_text="",
+):
+    """Same output as `get_page_description`, but from already loaded item details"""
+    item_description = description
     if not item_description:
         item_description = (
-            Span(get_page_number(item_id), cls=TextPresets.bold_sm if is_bold else ""),
-            Span(" - ", get_surah_name(item_id=item_id)),
+            Span(page_number, cls=TextPresets.bold_sm if is_bold else ""),
+            Span(" - ", surah_name),
             Span(custom_text) if custom_text else "",
         )
 
@@ -446,12 +983,11 @@ def get_page_description(
 
 
 def get_last_item_id():
-    return items(where="active = 1", order_by="id DESC")[0].id
+    return get_active_item_ids()[-1]
 
 
 def find_next_item_id(item_id):
-    item_ids = [item.id for item in items(where="active = 1")]
-    return find_next_greater(item_ids, item_id)
+    return find_next_greater(get_active_item_ids(), item_id)
 
 
 def get_mode_count(item_id, mode_id):
@@ -460,19 +996,15 @@ def get_mode_count(item_id, mode_id):
 
 
 def get_page_count(records: list[Revision] = None, item_ids: list = None) -> float:
-    total_count = 0
     # Get items to process
     if item_ids:
         process_items = item_ids
     elif records:
         process_items = [record.item_id for record in records]
     else:
-        return format_number(total_count)
-    # Calculate page count
-    for item_id in process_items:
-        page_no = items[item_id].page_id
-        total_parts = items(where=f"page_id = {page_no} and active = 1")
-        total_count += 1 / len(total_parts)
+        return format_number(0)
+    # Sum of the page weights of the items
+    total_count = get_page_weights()[np.asarray(process_items, dtype=int)].sum()
     return format_number(total_count)
 
 
@@ -480,14 +1012,177 @@ def get_unique_page_count(recent_review_items):
     return len(set(map(get_page_number, recent_review_items)))
 
 
-def get_revision_data(mode_id: str, revision_date: str):
-    """Returns the revision count and revision ID for a specific date and mode ID."""
-    records = revisions(
-        where=f"mode_id = '{mode_id}' AND revision_date = '{revision_date}'"
+######## Dashboard Snapshot ########
+
+
+@dataclass
+class DashboardSnapshot:
+    """
+    In-memory copy of everything the home page needs for a hafiz on a given date.
+
+    It is loaded by `load_dashboard_snapshot` with a fixed number of queries,
+    so rendering the summary tables doesn't issue any per-row lookups.
+    """
+
+    current_date: str
+    # item_id -> item, page, surah and hafizs_items columns (ordered by item_id)
+    items: dict
+    # revisions of the current_date and the day before
+    revisions: list
+    # (item_id, mode_id) -> revision count
+    mode_counts: dict
+    # (revision_date, mode_id) -> daily_progress row
+    daily_progress: dict
+    # full cycle revisions of the current plan
+    plan_revisions: list
+    last_memorized_item_id: int
+    modes: dict
+
+    @property
+    def yesterday(self):
+        return sub_days_to_date(self.current_date, 1)
+
+    @property
+    def active_item_ids(self):
+        return [i for i, item in self.items.items() if item["active"] == 1]
+
+    def hafiz_items(self, mode_ids: list):
+        """hafizs_items rows of the given modes, ordered by item_id"""
+        mode_ids = list(map(int, mode_ids))
+        return [
+            item
+            for item in self.items.values()
+            if item["hafizs_items_id"] is not None and item["mode_id"] in mode_ids
+        ]
+
+    def revisions_on(
+        self, revision_date: str, mode_ids: list = None, item_id=None, **kwargs
+    ):
+        """Revisions of a date filtered by mode_ids, item_id and any other column (eg: plan_id)"""
+        mode_ids = list(map(int, mode_ids)) if mode_ids is not None else None
+        return [
+            rev
+            for rev in self.revisions
+            if rev["revision_date"] == revision_date
+            and (mode_ids is None or rev["mode_id"] in mode_ids)
+            and (item_id is None or rev["item_id"] == int(item_id))
+            and all(rev[k] == v for k, v in kwargs.items())
+        ]
+
+    def mode_count(self, item_id: int, mode_id: int):
+        return self.mode_counts.get((int(item_id), int(mode_id)), 0)
+
+    def page_count(self, item_ids: list) -> float:
+        return get_page_count(item_ids=item_ids)
+
+    def revision_page_count(self, revision_date: str, mode_ids: list = None) -> float:
+        """Page count of the revisions of a date (and modes)"""
+        total_count = sum(
+            progress["page_count"]
+            for progress in self.progress_on(revision_date, mode_ids)
+        )
+        return format_number(total_count)
+
+    def revision_ids_on(self, revision_date: str, mode_ids: list = None) -> list:
+        return sorted(
+            rev_id
+            for progress in self.progress_on(revision_date, mode_ids)
+            for rev_id in progress["revision_ids"]
+        )
+
+    def progress_on(self, revision_date: str, mode_ids: list = None):
+        return [
+            progress
+            for (_date, mode_id), progress in self.daily_progress.items()
+            if _date == revision_date and (mode_ids is None or mode_id in mode_ids)
+        ]
+
+    def page_description(self, item_id: int, **kwargs):
+        item = self.items[item_id]
+        return render_page_description(
+            item_id,
+            description=item["description"],
+            page_number=item["page_number"],
+            surah_name=item["surah_name"],
+            **kwargs,
+        )
+
+    def srs_interval_list(self, item_id: int):
+        return get_booster_pack_ladder(self.items[item_id]["srs_booster_pack_id"]).intervals
+
+    def rating_intervals(self, item_id: int, is_edit: bool) -> dict:
+        """rating -> next interval of the three ratings, for the dropdown"""
+        item = self.items[item_id]
+        return get_booster_pack_ladder(item["srs_booster_pack_id"]).rating_intervals(
+            item["last_interval"] if is_edit else item["next_interval"],
+            is_dropdown=True,
+        )
+
+
+def load_dashboard_snapshot(auth, current_date: str, plan_id=None):
+    yesterday = sub_days_to_date(current_date, 1)
+
+    items_qry = f"""
+        SELECT items.id AS item_id, items.page_id, items.description, items.start_text, items.active,
+        pages.page_number, surahs.name AS surah_name,
+        hafizs_items.id AS hafizs_items_id, hafizs_items.mode_id, hafizs_items.status,
+        hafizs_items.page_number AS hafiz_page_number, hafizs_items.next_review, hafizs_items.last_review,
+        hafizs_items.srs_booster_pack_id, hafizs_items.last_interval, hafizs_items.next_interval
+        FROM items
+        LEFT JOIN pages ON items.page_id = pages.id
+        LEFT JOIN surahs ON items.surah_id = surahs.id
+        LEFT JOIN hafizs_items ON items.id = hafizs_items.item_id AND hafizs_items.hafiz_id = {auth}
+        ORDER BY items.id ASC
+    """
+    items_data = {r["item_id"]: r for r in db.q(items_qry)}
+
+    revisions_qry = f"""
+        SELECT id, item_id, mode_id, rating, plan_id, revision_date FROM revisions
+        WHERE hafiz_id = {auth} AND revision_date IN ('{current_date}', '{yesterday}')
+        ORDER BY id ASC
+    """
+    mode_counts_qry = f"""
+        SELECT item_id, mode_id, COUNT(*) AS count FROM revisions
+        WHERE hafiz_id = {auth}
+        GROUP BY item_id, mode_id
+    """
+    mode_counts = {
+        (r["item_id"], r["mode_id"]): r["count"] for r in db.q(mode_counts_qry)
+    }
+
+    daily_progress = get_daily_progress(auth, yesterday, current_date)
+
+    if plan_id is not None:
+        plan_revisions = db.q(
+            f"""
+            SELECT id, item_id, revision_date FROM revisions
+            WHERE hafiz_id = {auth} AND mode_id = 1 AND plan_id = {plan_id}
+            ORDER BY revision_date ASC, id ASC
+            """
+        )
+    else:
+        plan_revisions = []
+
+    last_memorized = db.q(
+        f"""
+        SELECT item_id FROM revisions WHERE hafiz_id = {auth} AND mode_id = 2
+        ORDER BY revision_date DESC, id DESC LIMIT 1
+        """
     )
-    rev_ids = ",".join(str(r.id) for r in records)
-    count = get_page_count(records)
-    return count, rev_ids
+
+    return DashboardSnapshot(
+        current_date=current_date,
+        items=items_data,
+        revisions=db.q(revisions_qry),
+        mode_counts=mode_counts,
+        daily_progress=daily_progress,
+        plan_revisions=plan_revisions,
+        last_memorized_item_id=(last_memorized[0]["item_id"] if last_memorized else 0),
+        modes=get_metadata("modes"),
+    )
+
+
+######## END ########
 
 
 def create_count_link(count: int, rev_ids: str):
@@ -530,8 +1225,8 @@ def render_type_description(list, _type=""):
 
     if _type == "Surah":
         _type = ""
-        first_description = surahs[first_description].name
-        last_description = surahs[last_description].name
+        first_description = get_metadata("surahs")[int(first_description)].name
+        last_description = get_metadata("surahs")[int(last_description)].name
 
     if len(list) == 1:
         return f"{_type} {first_description}"
@@ -690,7 +1385,7 @@ def split_page_range(page_range: str):
 # eg: sorted(mode_ids, key=lambda id: extract_mode_sort_number(id))
 def extract_mode_sort_number(mode_id):
     """Extract the number from mode name like '1. full Cycle' -> 1"""
-    mode_name = modes[mode_id].name
+    mode_name = get_metadata("modes")[int(mode_id)].name
     return int(mode_name.split(". ")[0])
 
 
@@ -748,12 +1443,8 @@ def update_review_dates(item_id: int, mode_id: int):
         hafizs_items.update(current_hafiz_item)
 
 
-def get_srs_interval_list(item_id: int):
-    current_hafiz_item = get_hafizs_items(item_id)
-    booster_pack_details = srs_booster_pack[current_hafiz_item.srs_booster_pack_id]
-    end_interval = booster_pack_details.end_interval
-
-    booster_pack_intervals = booster_pack_details.interval_days.split(",")
+def parse_srs_interval_list(interval_days: str, end_interval: int):
+    booster_pack_intervals = interval_days.split(",")
     booster_pack_intervals = list(map(int, booster_pack_intervals))
 
     # Filter numbers less than end_interval
@@ -805,20 +1496,9 @@ def get_interval_based_on_rating(
     else:
         current_interval = current_hafiz_item.next_interval
 
-    intervals = get_srs_interval_list(item_id)
-    rating_intervals = get_interval_triplet(
-        current_interval=current_interval, interval_list=intervals
-    )
-    current_rating_interval = rating_intervals[rating + 1]
-
-    # This logic is to show the user that the item is finished after this record
-    if is_dropdown:
-        end_interval = srs_booster_pack[
-            current_hafiz_item.srs_booster_pack_id
-        ].end_interval
-        if current_rating_interval > end_interval:
-            return "Finished"
-    return current_rating_interval
+    # This logic is to show the user that the item is finished after this record (for the dropdown)
+    ladder = get_booster_pack_ladder(current_hafiz_item.srs_booster_pack_id)
+    return ladder.rating_intervals(current_interval, is_dropdown=is_dropdown)[rating]
 
 
 # This function is responsible for creating and deleting records on the srs
@@ -828,7 +1508,7 @@ def update_hafiz_items_for_srs(
     if is_checked:
         latest_revision_date = get_lastest_date(item_id, mode_id)
         current_hafiz_item = get_hafizs_items(item_id)
-        end_interval = srs_booster_pack[
+        end_interval = get_metadata("srs_booster_pack")[
             current_hafiz_item.srs_booster_pack_id
         ].end_interval
         # TODO: the current_interval is difference between last_review and current_date instead of the last_interval
@@ -854,6 +1534,7 @@ def update_hafiz_items_for_srs(
 
 
 def checkbox_update_logic(mode_id, rating, item_id, date, is_checked, plan_id=None):
+    inserted_revision = None
     conditions = [
         f"revision_date = '{date}'",
         f"item_id = {item_id}",
@@ -880,7 +1561,7 @@ def checkbox_update_logic(mode_id, rating, item_id, date, is_checked, plan_id=No
         if mode_id == 5:
             # Update the additional three columns if it is srs mode
             hafiz_items_data = get_hafizs_items(item_id)
-            end_interval = srs_booster_pack[
+            end_interval = get_metadata("srs_booster_pack")[
                 hafiz_items_data.srs_booster_pack_id
             ].end_interval
             revision_data["last_interval"] = hafiz_items_data.next_interval
@@ -891,7 +1572,7 @@ def checkbox_update_logic(mode_id, rating, item_id, date, is_checked, plan_id=No
             if end_interval > next_interval:
                 revision_data["next_interval"] = next_interval
 
-        revisions.insert(Revision(**revision_data))
+        inserted_revision = revisions.insert(Revision(**revision_data))
 
     elif revisions_data and not is_checked:
         # Delete existing revision
@@ -917,8 +1598,111 @@ def checkbox_update_logic(mode_id, rating, item_id, date, is_checked, plan_id=No
         # Update the review dates based on the mode -> RR should increment by one and WL should increment by 7
         update_review_dates(item_id, mode_id)
 
-    # After the operation populate the stats columns
-    populate_hafizs_items_stat_columns(item_id=item_id)
+    # After the operation update the stats columns
+    if inserted_revision:
+        apply_revision_stats_delta(inserted_revision)
+    else:
+        populate_hafizs_items_stat_columns(item_id=item_id)
+
+
+def bulk_update_revisions(
+    auth, mode_id: int, date: str, entries: list[tuple], plan_id=None
+) -> dict:
+    """
+    Bulk version of `checkbox_update_logic` for `(item_id, rating, is_checked)` entries, in one transaction.
+
+    The revisions are inserted/deleted with executemany and the review dates and stats
+    of the hafizs_items are updated with set based queries.
+
+    Returns:
+        dict: item_id -> "added", "removed" or "unchanged"
+    """
+    entries = [(int(i), int(r), bool(c)) for i, r, c in entries]
+    if not entries:
+        return {}
+    item_ids = [e[0] for e in entries]
+    item_ids_str = ", ".join(map(str, item_ids))
+    plan_condition = f"AND plan_id = {plan_id}" if plan_id is not None else ""
+
+    existing_revisions = {}
+    for rev in db.q(
+        f"""
+        SELECT id, item_id FROM revisions
+        WHERE hafiz_id = {auth} AND revision_date = '{date}' AND mode_id = {mode_id}
+        AND item_id IN ({item_ids_str}) {plan_condition}
+        ORDER BY id ASC
+        """
+    ):
+        existing_revisions.setdefault(rev["item_id"], rev["id"])
+
+    results = {}
+    new_revisions = []
+    deleted_revision_ids = []
+    for item_id, rating, is_checked in entries:
+        if item_id not in existing_revisions and is_checked:
+            results[item_id] = "added"
+            new_revisions.append((auth, item_id, date, rating, mode_id, plan_id))
+        elif item_id in existing_revisions and not is_checked:
+            results[item_id] = "removed"
+            deleted_revision_ids.append((existing_revisions[item_id],))
+        else:
+            results[item_id] = "unchanged"
+
+    with db.conn:
+        # The SRS intervals depend on the previous revision of the item, so they are handled one by one
+        if mode_id == 5:
+            for item_id, rating, is_checked in entries:
+                checkbox_update_logic(
+                    mode_id=mode_id,
+                    rating=rating,
+                    item_id=item_id,
+                    date=date,
+                    is_checked=is_checked,
+                    plan_id=plan_id,
+                )
+            return results
+
+        db.conn.executemany(
+            "INSERT INTO revisions (hafiz_id, item_id, revision_date, rating, mode_id, plan_id) VALUES (?, ?, ?, ?, ?, ?)",
+            new_revisions,
+        )
+        db.conn.executemany("DELETE FROM revisions WHERE id = ?", deleted_revision_ids)
+
+        if mode_id == 2:
+            for is_checked, status, new_mode_id in [
+                (True, "newly_memorized", 2),
+                (False, None, 1),
+            ]:
+                current_item_ids = [e[0] for e in entries if e[2] == is_checked]
+                db.execute(
+                    f"""
+                    UPDATE hafizs_items SET status = ?, mode_id = ?
+                    WHERE hafiz_id = {auth} AND item_id IN ({", ".join(map(str, current_item_ids))})
+                    """,
+                    [status, new_mode_id],
+                )
+        elif mode_id in (3, 4):
+            # Same as `update_review_dates`: RR should increment by one and WL should increment by 7
+            increment_day = 1 if mode_id == 3 else 7
+            review_mode_ids = "2, 3" if mode_id == 3 else "3, 4"
+            db.execute(
+                f"""
+                UPDATE hafizs_items SET
+                mode_id = CASE WHEN hafizs_items.mode_id = 2 THEN 3 ELSE hafizs_items.mode_id END,
+                last_review = latest.revision_date,
+                next_review = DATE(latest.revision_date, '+{increment_day} days')
+                FROM (
+                    SELECT item_id, MAX(revision_date) AS revision_date FROM revisions
+                    WHERE hafiz_id = {auth} AND mode_id IN ({review_mode_ids}) AND item_id IN ({item_ids_str})
+                    GROUP BY item_id
+                ) AS latest
+                WHERE hafizs_items.hafiz_id = {auth} AND hafizs_items.item_id = latest.item_id
+                """
+            )
+
+        populate_hafizs_items_stat_columns(hafiz_id=auth, item_ids=item_ids)
+
+    return results
 
 
 def graduate_the_item_id(item_id: int, mode_id: int, auth: int, checked: bool = True):
@@ -966,45 +1750,153 @@ def graduate_the_item_id(item_id: int, mode_id: int, auth: int, checked: bool =
     update_hafizs_items_table(item_id, data_to_update)
 
 
+def graduate_reviewed_items(auth: int, close_date: str):
+    """
+    Set-based `graduate_the_item_id` for the items reviewed on the `close_date`:
+    - recent review and watch list items with more than 6 revisions in that mode
+    - SRS items whose next_interval is beyond the end_interval of their booster pack
+    """
+    graduation_qry = f"""
+        WITH reviewed AS (
+            SELECT DISTINCT item_id, mode_id FROM revisions
+            WHERE hafiz_id = {auth} AND revision_date = '{close_date}' AND mode_id IN (3, 4, 5)
+        ),
+        mode_counts AS (
+            SELECT revisions.item_id, revisions.mode_id, COUNT(*) AS count FROM revisions
+            JOIN reviewed ON revisions.item_id = reviewed.item_id AND revisions.mode_id = reviewed.mode_id
+            WHERE revisions.hafiz_id = {auth}
+            GROUP BY revisions.item_id, revisions.mode_id
+        )
+        SELECT reviewed.item_id, reviewed.mode_id FROM reviewed
+        JOIN mode_counts ON reviewed.item_id = mode_counts.item_id AND reviewed.mode_id = mode_counts.mode_id
+        LEFT JOIN hafizs_items ON hafizs_items.item_id = reviewed.item_id AND hafizs_items.hafiz_id = {auth}
+        LEFT JOIN srs_booster_pack ON hafizs_items.srs_booster_pack_id = srs_booster_pack.id
+        WHERE (reviewed.mode_id IN (3, 4) AND mode_counts.count > 6)
+        OR (reviewed.mode_id = 5 AND hafizs_items.next_interval > srs_booster_pack.end_interval)
+    """
+    graduating = defaultdict(list)
+    for r in db.q(graduation_qry):
+        graduating[r["mode_id"]].append(str(r["item_id"]))
+
+    def latest_review_qry(item_ids, mode_ids):
+        """Same as `get_lastest_date` for all the `item_ids`"""
+        return f"""
+            SELECT item_id, MAX(revision_date) AS revision_date FROM revisions
+            WHERE hafiz_id = {auth} AND mode_id IN ({mode_ids}) AND item_id IN ({", ".join(item_ids)})
+            GROUP BY item_id
+        """
+
+    # recent review -> watch list
+    if graduating[3]:
+        db.execute(
+            f"""
+            UPDATE hafizs_items SET status = 'newly_memorized', mode_id = 4,
+            last_review = latest.revision_date, next_review = DATE(latest.revision_date, '+7 days'),
+            watch_list_graduation_date = NULL
+            FROM ({latest_review_qry(graduating[3], "2, 3")}) AS latest
+            WHERE hafizs_items.hafiz_id = {auth} AND hafizs_items.item_id = latest.item_id
+            """
+        )
+    # watch list -> memorized
+    if graduating[4]:
+        db.execute(
+            f"""
+            UPDATE hafizs_items SET status = 'memorized', mode_id = 1,
+            last_review = NULL, next_review = NULL, watch_list_graduation_date = '{close_date}'
+            WHERE hafiz_id = {auth} AND item_id IN ({", ".join(graduating[4])})
+            """
+        )
+    # SRS -> memorized
+    if graduating[5]:
+        db.execute(
+            f"""
+            UPDATE hafizs_items SET status = 'memorized', mode_id = 1,
+            last_review = latest.revision_date, next_review = NULL,
+            last_interval = NULL, current_interval = NULL, next_interval = NULL,
+            srs_booster_pack_id = NULL, srs_start_date = NULL
+            FROM ({latest_review_qry(graduating[5], "5")}) AS latest
+            WHERE hafizs_items.hafiz_id = {auth} AND hafizs_items.item_id = latest.item_id
+            """
+        )
+    return {mode_id: len(item_ids) for mode_id, item_ids in graduating.items()}
+
+
+def close_dates(auth: int, days: int = 1) -> str:
+    """
+    Close the current date of the hafiz `days` times in one transaction (eg: to catch up after a break),
+    graduating the items reviewed on each of the closed dates. Returns the new current_date.
+    """
+    current_date = get_current_date(auth)
+    new_current_date = add_days_to_date(current_date, days)
+    # Only the dates with reviews can graduate items
+    reviewed_dates = db.q(
+        f"""
+        SELECT DISTINCT revision_date FROM revisions
+        WHERE hafiz_id = {auth} AND mode_id IN (3, 4, 5)
+        AND revision_date >= '{current_date}' AND revision_date < '{new_current_date}'
+        ORDER BY revision_date ASC
+        """
+    )
+    with db.conn:
+        for r in reviewed_dates:
+            graduate_reviewed_items(auth, r["revision_date"])
+        hafizs.update(current_date=new_current_date, id=auth)
+    return new_current_date
+
+
 ####################### END #######################
 
 
-def datewise_summary_table(show=None, hafiz_id=None):
-    qry = f"SELECT MIN(revision_date) AS earliest_date FROM {revisions}"
-    qry = (qry + f" WHERE hafiz_id = {hafiz_id}") if hafiz_id else qry
+REPORT_WINDOW_DAYS = 30
+
+
+def datewise_summary_table(show=REPORT_WINDOW_DAYS, hafiz_id=None, end_date=None):
+    """
+    Datewise summary of the revisions for the `show` number of days till the `end_date` (defaults to the current_date).
+    All the revisions of the window are fetched with a single query and grouped in memory.
+    """
+    hafiz_condition = f"revisions.hafiz_id = {hafiz_id}" if hafiz_id else "1 = 1"
+    qry = f"SELECT MIN(revision_date) AS earliest_date FROM {revisions} WHERE {hafiz_condition}"
     result = db.q(qry)
     earliest_date = result[0]["earliest_date"]
     current_date = get_current_date(hafiz_id)
+    end_date = end_date or current_date
+    start_date = sub_days_to_date(end_date, show - 1)
 
     date_range = pd.date_range(
-        start=(earliest_date or current_date), end=current_date, freq="D"
+        start=max(earliest_date or end_date, start_date), end=end_date, freq="D"
     )
     date_range = [date.strftime("%Y-%m-%d") for date in date_range][::-1]
-    date_range = date_range[:show] if show else date_range
+
+    # Joining the revisions and items table to get these columns
+    # rev_id(Ids are needed for bulk_edit),
+    # items_id(To correctly render the surah name if its starts from part),
+    # page_id(To group pages into range)
+    rev_query = f"""
+        SELECT revisions.id, revisions.item_id, revisions.revision_date, revisions.mode_id, items.page_id
+        FROM {revisions} LEFT JOIN {items} ON revisions.item_id = items.id
+        WHERE {hafiz_condition} AND revisions.revision_date BETWEEN '{start_date}' AND '{end_date}'
+        ORDER BY revisions.id ASC
+    """
+    # revision_date -> mode_id -> revisions
+    grouped_revisions = defaultdict(lambda: defaultdict(list))
+    for rev in db.q(rev_query):
+        grouped_revisions[rev["revision_date"]][rev["mode_id"]].append(rev)
 
     def _render_datewise_row(date):
         # Get the unique modes for that particular date
-        rev_condition = f"WHERE revisions.revision_date = '{date}'" + (
-            f" AND revisions.hafiz_id = {hafiz_id}" if hafiz_id else ""
-        )
-        unique_modes = db.q(f"SELECT DISTINCT mode_id FROM {revisions} {rev_condition}")
-        unique_modes = [m["mode_id"] for m in unique_modes]
-        unique_modes = sorted(unique_modes, key=lambda id: extract_mode_sort_number(id))
-
-        mode_with_ids_and_pages = []
-        for mode_id in unique_modes:
-            # Joining the revisions and items table to get these columns
-            # rev_id(Ids are needed for bulk_edit),
-            # items_id(To correctly render the surah name if its starts from part),
-            # page_id(To group pages into range)
-            rev_query = f"SELECT revisions.id, revisions.item_id, items.page_id FROM {revisions} LEFT JOIN {items} ON revisions.item_id = items.id {rev_condition} AND mode_id = {mode_id}"
-            current_date_and_mode_revisions = db.q(rev_query)
-            mode_with_ids_and_pages.append(
-                {
-                    "mode_id": mode_id,
-                    "revision_data": current_date_and_mode_revisions,
-                }
-            )
+        unique_modes = sorted(
+            grouped_revisions[date].keys(),
+            key=lambda id: extract_mode_sort_number(id),
+        )
+
+        mode_with_ids_and_pages = [
+            {
+                "mode_id": mode_id,
+                "revision_data": grouped_revisions[date][mode_id],
+            }
+            for mode_id in unique_modes
+        ]
 
         def _render_pages_range(revisions_data: list):
             page_ranges = compact_format(sorted([r["page_id"] for r in revisions_data]))
@@ -1095,7 +1987,7 @@ def datewise_summary_table(show=None, hafiz_id=None):
                     if mode_with_ids_and_pages[0]["mode_id"] == o["mode_id"]
                     else ()
                 ),
-                Td(modes[o["mode_id"]].name),
+                Td(get_mode_name(o["mode_id"])),
                 Td(len(o["revision_data"])),
                 Td(_render_pages_range(o["revision_data"])),
             )
@@ -1103,6 +1995,25 @@ def datewise_summary_table(show=None, hafiz_id=None):
         ]
         return rows
 
+    # Load the previous window, if there are revisions older than this window
+    if earliest_date and earliest_date < start_date:
+        load_older_row = Tr(
+            Td(
+                Button(
+                    "Load older",
+                    hx_get=f"/report?end_date={sub_days_to_date(start_date, 1)}",
+                    hx_select="tbody > tr",
+                    hx_target="closest tr",
+                    hx_swap="outerHTML",
+                    cls=(ButtonT.default, "px-2 py-3 h-0"),
+                ),
+                colspan="5",
+                cls="text-center",
+            )
+        )
+    else:
+        load_older_row = None
+
     datewise_table = Div(
         Table(
             Thead(
@@ -1114,7 +2025,10 @@ def datewise_summary_table(show=None, hafiz_id=None):
                     Th("Range"),
                 )
             ),
-            Tbody(*flatten_list(map(_render_datewise_row, date_range))),
+            Tbody(
+                *flatten_list(map(_render_datewise_row, date_range)),
+                load_older_row,
+            ),
         ),
         cls="uk-overflow-auto",
     )
@@ -1179,7 +2093,6 @@ def login_post(login: Login, sess):
     if not compare_digest(u.password.encode("utf-8"), login.password.encode("utf-8")):
         return login_redir
     sess["user_auth"] = u.id
-    hafizs_users.xtra(id=u.id)
     return RedirectResponse("/", status_code=303)
 
 
@@ -1209,10 +2122,6 @@ def add_hafiz_and_relations(hafiz: Hafiz, relationship: str, sess):
 
 @app.get("/hafiz_selection")
 def hafiz_selection(sess):
-    # In beforeware we are adding the hafiz_id filter using xtra
-    # we have to reset that xtra attribute in order to show revisions for all hafiz
-    revisions.xtra()
-    hafizs_users.xtra()
     auth = sess.get("auth", None)
     user_auth = sess.get("user_auth", None)
     if user_auth is None:
@@ -1331,8 +2240,11 @@ def main_area(*args, active=None, auth=None):
 def tables_main_area(*args, active_table=None, auth=None):
     is_active = lambda x: "uk-active" if x == active_table else None
 
+    # daily_progress is derived from the revisions (by triggers), so it is not editable
     tables_list = [
-        t for t in str(tables).split(", ") if not t.startswith(("sqlite", "_"))
+        t
+        for t in str(tables).split(", ")
+        if not t.startswith(("sqlite", "_")) and t != "daily_progress"
     ]
     table_links = [
         Li(A(t.capitalize(), href=f"/tables/{t}"), cls=is_active(t))
@@ -1361,25 +2273,24 @@ def tables_main_area(*args, active_table=None, auth=None):
     )
 
 
-def render_stats_summary_table(auth, target_counts):
-    current_date = get_current_date(auth)
+def render_stats_summary_table(auth, target_counts, snapshot: DashboardSnapshot):
+    current_date = snapshot.current_date
     today = current_date
-    yesterday = sub_days_to_date(today, 1)
-    today_completed_count = get_page_count(
-        revisions(where=f"revision_date = '{today}'")
-    )
-    yesterday_completed_count = get_page_count(
-        revisions(where=f"revision_date = '{yesterday}'")
-    )
+    yesterday = snapshot.yesterday
+    today_completed_count = snapshot.revision_page_count(today)
+    yesterday_completed_count = snapshot.revision_page_count(yesterday)
     current_date_description = P(
         Span("System Date: ", cls=TextPresets.bold_lg),
         Span(date_to_human_readable(current_date), id="current_date_description"),
     )
-    mode_ids = [mode.id for mode in modes()]
+    mode_ids = list(snapshot.modes.keys())
     sorted_mode_ids = sorted(mode_ids, key=lambda x: extract_mode_sort_number(x))
 
     def render_count(mode_id, revision_date, is_link=True, show_dash_for_zero=False):
-        count, item_ids = get_revision_data(mode_id, revision_date)
+        item_ids = ",".join(
+            map(str, snapshot.revision_ids_on(revision_date, mode_ids=[mode_id]))
+        )
+        count = snapshot.revision_page_count(revision_date, mode_ids=[mode_id])
 
         if count == 0:
             if show_dash_for_zero:
@@ -1410,7 +2321,7 @@ def render_stats_summary_table(auth, target_counts):
             current_mode_id, yesterday, is_link=True, show_dash_for_zero=True
         )
         return Tr(
-            Td(f"{modes[current_mode_id].name}"),
+            Td(f"{snapshot.modes[current_mode_id].name}"),
             Td(progress_display),
             Td(yesterday_display),
             id=f"stat-row-{current_mode_id}",
@@ -1470,8 +2381,8 @@ def custom_entry_inputs(plan_id):
     """
     This function is used to retain the input values in the form and display the custom entry inputs
     """
-    revision_data = revisions(where="mode_id = 1")
-    last_added_item_id = revision_data[-1].item_id if revision_data else None
+    revision_data = revisions(where="mode_id = 1", order_by="id DESC", limit=1)
+    last_added_item_id = revision_data[0].item_id if revision_data else None
 
     if last_added_item_id:
         item_details = items[last_added_item_id]
@@ -1535,9 +2446,6 @@ def custom_entry_inputs(plan_id):
 def index(auth, sess, full_cycle_display_count: int = None):
     current_date = get_current_date(auth)
     ################### Overall summary ###################
-    # Sequential revision table
-    seq_id = "1"
-
     unique_seq_plan_id = [
         i.id for i in plans(where="completed <> 1", order_by="id DESC")
     ]
@@ -1547,38 +2455,34 @@ def index(auth, sess, full_cycle_display_count: int = None):
     else:
         plan_id = None
 
+    # All the data needed for the summary tables is loaded once here
+    snapshot = load_dashboard_snapshot(auth, current_date, plan_id)
+    active_item_ids = snapshot.active_item_ids
+
     if plan_id is None:
         items_gaps_with_limit = []
     else:
-        current_plan_item_ids = sorted(
-            [
-                r.item_id
-                for r in revisions(
-                    where=f"mode_id = '{seq_id}' AND plan_id = '{unique_seq_plan_id[0]}'"
-                )
-            ]
-        )
-        item_ids = [i.id for i in items(where="active = 1")]
+        current_plan_item_ids = sorted([r["item_id"] for r in snapshot.plan_revisions])
         # this will return the gap of the current_plan_item_ids based on the master(items_id)
-        items_gaps_with_limit = find_gaps(current_plan_item_ids, item_ids)
+        items_gaps_with_limit = find_gaps(current_plan_item_ids, active_item_ids)
 
     def render_overall_row(o: tuple):
         last_added_item_id, upper_limit = o
         # If there are items after the last_added_item_id then it will come as `None`
         # So we are handling them here by setting the upper limit based on the items
-        upper_limit = get_last_item_id() if upper_limit is None else upper_limit
+        upper_limit = active_item_ids[-1] if upper_limit is None else upper_limit
 
-        next_item_id = find_next_item_id(last_added_item_id)
+        next_item_id = find_next_greater(active_item_ids, last_added_item_id)
 
         if next_item_id is None:
             next_page = "No further page"
             action_buttons = None
         else:
-            next_page = get_page_description(next_item_id)
+            next_page = snapshot.page_description(next_item_id)
             action_buttons = DivLAligned(
                 Button(
                     "Bulk",
-                    hx_get=f"revision/bulk_add?item_id={next_item_id}&plan_id={plan_id}&max_item_id={get_last_item_id() if upper_limit is None else upper_limit}",
+                    hx_get=f"revision/bulk_add?item_id={next_item_id}&plan_id={plan_id}&max_item_id={upper_limit}",
                     hx_target="body",
                     hx_push_url="true",
                     cls=(ButtonT.default, "p-2"),
@@ -1599,18 +2503,18 @@ def index(auth, sess, full_cycle_display_count: int = None):
         )
 
     if plan_id:
-        current_plans_revision_date = revisions(
-            where=f"plan_id = {plan_id} AND mode_id = {seq_id}",
-            order_by="revision_date ASC",
-        )
+        current_plans_revision_date = snapshot.plan_revisions
 
         if current_plans_revision_date:
             unique_pages = list(
-                set([get_page_number(i.item_id) for i in current_plans_revision_date])
+                set(
+                    snapshot.items[i["item_id"]]["page_number"]
+                    for i in current_plans_revision_date
+                )
             )
             total_pages = len(unique_pages)
 
-            first_date = current_plans_revision_date[0].revision_date
+            first_date = current_plans_revision_date[0]["revision_date"]
             total_days = calculate_days_difference(first_date, current_date)
 
             average_pages = total_pages / total_days
@@ -1635,13 +2539,12 @@ def index(auth, sess, full_cycle_display_count: int = None):
 
     def get_monthly_target_and_progress():
         """This function will return the monthly target and the progress of the monthly review"""
-        current_date = get_current_date(auth)
         memorized_len = len(
-            hafizs_items(where=f"hafiz_id = {auth} and status = 'memorized'")
+            [i for i in snapshot.items.values() if i["status"] == "memorized"]
         )
         monthly_review_target = round(memorized_len / 30)
-        monthly_reviews_completed_today = get_page_count(
-            revisions(where=f"mode_id = '1' and revision_date='{current_date}'")
+        monthly_reviews_completed_today = snapshot.revision_page_count(
+            current_date, mode_ids=[1]
         )
         return monthly_review_target, monthly_reviews_completed_today
 
@@ -1684,6 +2587,7 @@ def index(auth, sess, full_cycle_display_count: int = None):
         mode_ids=["1"],
         route="monthly_cycle",
         auth=auth,
+        snapshot=snapshot,
         total_display_count=total_display_count,
         plan_id=plan_id,
     )
@@ -1697,7 +2601,7 @@ def index(auth, sess, full_cycle_display_count: int = None):
     # Display Monthly cycle accordion with its data
     overall_table = AccordionItem(
         Span(
-            f"{modes[1].name} - ",
+            f"{snapshot.modes[1].name} - ",
             monthly_progress_display,
             id=f"monthly_cycle-header",
         ),
@@ -1729,26 +2633,28 @@ def index(auth, sess, full_cycle_display_count: int = None):
     ############################# END ################################
 
     recent_review_table, recent_review_items = make_summary_table(
-        mode_ids=["2", "3"], route="recent_review", auth=auth
+        mode_ids=["2", "3"], route="recent_review", auth=auth, snapshot=snapshot
     )
 
-    recent_review_target = get_page_count(item_ids=recent_review_items)
+    recent_review_target = snapshot.page_count(recent_review_items)
 
     watch_list_table, watch_list_items = make_summary_table(
-        mode_ids=["4"], route="watch_list", auth=auth
+        mode_ids=["4"], route="watch_list", auth=auth, snapshot=snapshot
     )
-    watch_list_target = get_page_count(item_ids=watch_list_items)
+    watch_list_target = snapshot.page_count(watch_list_items)
 
     new_memorization_table, new_memorization_items = (
         make_new_memorization_summary_table(
-            mode_ids=["2"], route="new_memorization", auth=auth
+            mode_ids=["2"], route="new_memorization", auth=auth, snapshot=snapshot
         )
     )
-    new_memorization_target = get_page_count(item_ids=new_memorization_items)
+    new_memorization_target = snapshot.page_count(new_memorization_items)
 
-    srs_table, srs_items = make_summary_table(mode_ids=["5"], route="srs", auth=auth)
+    srs_table, srs_items = make_summary_table(
+        mode_ids=["5"], route="srs", auth=auth, snapshot=snapshot
+    )
 
-    srs_target = get_page_count(item_ids=srs_items)
+    srs_target = snapshot.page_count(srs_items)
 
     modal = ModalContainer(
         ModalDialog(
@@ -1769,11 +2675,11 @@ def index(auth, sess, full_cycle_display_count: int = None):
     )
 
     tables_dict = {
-        modes[1].name: overall_table if items_gaps_with_limit else None,
-        modes[2].name: new_memorization_table,
-        modes[3].name: recent_review_table,
-        modes[4].name: watch_list_table,
-        modes[5].name: srs_table,
+        snapshot.modes[1].name: overall_table if items_gaps_with_limit else None,
+        snapshot.modes[2].name: new_memorization_table,
+        snapshot.modes[3].name: recent_review_table,
+        snapshot.modes[4].name: watch_list_table,
+        snapshot.modes[5].name: srs_table,
         # datewise_summary_table(hafiz_id=auth),
     }
 
@@ -1793,7 +2699,9 @@ def index(auth, sess, full_cycle_display_count: int = None):
         5: srs_target,
     }
     # FIXME: need to pass argument as keyword argument
-    stat_table = render_stats_summary_table(auth=auth, target_counts=target_counts)
+    stat_table = render_stats_summary_table(
+        auth=auth, target_counts=target_counts, snapshot=snapshot
+    )
 
     return main_area(
         Div(stat_table, Divider(), Accordion(*tables, multiple=True, animation=True)),
@@ -1804,33 +2712,18 @@ def index(auth, sess, full_cycle_display_count: int = None):
 
 
 @app.get("/close_date")
-def change_the_current_date(auth):
-    hafiz_data = hafizs[auth]
-
-    # This will retrive the revision records of the recent review, watch list and SRS for the current date as per the hafiz
-    revision_data = revisions(
-        where=f" revision_date = '{hafiz_data.current_date}' AND mode_id IN (3, 4, 5)"
-    )
-    for rev in revision_data:
-        # if the count is greater than 6 which is not in srs mode then it will graduate that item to next level
-        if get_mode_count(rev.item_id, rev.mode_id) > 6 and rev.mode_id != 5:
-            graduate_the_item_id(rev.item_id, rev.mode_id, auth)
-        # if the next_interval is greater than the end_interval(srs_booster_pack table) then it will graduate that item to monthly cycle
-        elif rev.mode_id == 5:
-            hafiz_items_details = get_hafizs_items(rev.item_id)
-            pack_details = srs_booster_pack[hafiz_items_details.srs_booster_pack_id]
-            if hafiz_items_details.next_interval > pack_details.end_interval:
-                graduate_the_item_id(rev.item_id, rev.mode_id, auth)
-
-    # This will update the hafiz current date
-    hafiz_data.current_date = add_days_to_date(hafiz_data.current_date, 1)
-    hafizs.update(hafiz_data)
+def change_the_current_date(auth, days: int = 1):
+    close_dates(auth, max(days, 1))
     return Redirect("/")
 
 
 @app.get("/report")
-def datewise_summary_table_view(auth):
-    return main_area(datewise_summary_table(hafiz_id=auth), active="Report", auth=auth)
+def datewise_summary_table_view(auth, end_date: str = None):
+    return main_area(
+        datewise_summary_table(hafiz_id=auth, end_date=end_date),
+        active="Report",
+        auth=auth,
+    )
 
 
 def render_new_memorization_checkbox(
@@ -1876,63 +2769,51 @@ def render_new_memorization_checkbox(
     return check_form
 
 
-def make_new_memorization_summary_table(auth: str, mode_ids: list[str], route: str):
-    current_date = get_current_date(auth)
-
-    def get_last_memorized_item_id():
-        """Get the last newly_memorized `item_id` for the hafiz."""
-        result = revisions(
-            where=f"hafiz_id = {auth} AND mode_id = 2",
-            order_by="revision_date DESC, id DESC",
-            limit=1,
-        )
-        return result[0].item_id if result else 0
+def make_new_memorization_summary_table(
+    auth: str, mode_ids: list[str], route: str, snapshot: DashboardSnapshot
+):
+    current_date = snapshot.current_date
+    today_revisions = snapshot.revisions_on(current_date, mode_ids=[2])
 
     def get_last_newly_memorized_page_for_today():
         """Get the page number of the last newly memorized item for today."""
-        qry = f"""
-            SELECT items.page_id AS page_number FROM revisions
-            JOIN items ON revisions.item_id = items.id 
-            WHERE revisions.hafiz_id = {auth} AND revisions.mode_id = 2 AND revisions.revision_date = '{current_date}'
-            ORDER BY revisions.id DESC;
-        """
-        result = db.q(qry)
-        return result[0]["page_number"] if result else None
+        if not today_revisions:
+            return None
+        return snapshot.items[today_revisions[-1]["item_id"]]["page_id"]
 
     def get_not_memorized_item_ids(page_id):
         """Get not memorized item for a given page."""
-        result = hafizs_items(where=f"page_number = {page_id} AND status IS NULL")
-        return [i.item_id for i in result]
+        return [
+            item["item_id"]
+            for item in snapshot.items.values()
+            if item["hafizs_items_id"] is not None
+            and item["hafiz_page_number"] == page_id
+            and item["status"] is None
+        ]
 
     def get_next_unmemorized_page_items(item_id):
         """Get the next closest unmemorized item_ids based on the last newly memorized `item_id`"""
-        qry = f"""
-            SELECT items.id AS item_id, items.page_id AS page_number FROM items
-            LEFT JOIN hafizs_items ON items.id = hafizs_items.item_id AND hafizs_items.hafiz_id = {auth}
-            WHERE hafizs_items.status IS NULL AND items.active != 0 AND items.id > {item_id}
-       """
-        ct = db.q(qry)
-        grouped = group_by_type(ct, "page")
-        if not grouped:
+        unmemorized_items = [
+            item
+            for item in snapshot.items.values()
+            if item["status"] is None
+            and item["active"] not in (0, None)
+            and item["item_id"] > item_id
+        ]
+        if not unmemorized_items:
             return []
-        first_page = next(iter(grouped))
-        return [i["item_id"] for i in grouped[first_page] if i]
-
-    def get_today_memorized_item_ids():
-        """Get today's newly_memorized items."""
-        result = revisions(where=f"mode_id = 2 AND revision_date = '{current_date}'")
-        return [i.item_id for i in result]
+        first_page = min(item["page_id"] for item in unmemorized_items)
+        return [i["item_id"] for i in unmemorized_items if i["page_id"] == first_page]
 
     today_page_id = get_last_newly_memorized_page_for_today()
     if today_page_id:
         unmemorized_items = get_not_memorized_item_ids(today_page_id)
     else:
         # If there are no newly memorized items for today, get the closest unmemorized items to display
-        last_newly_memorized_item_id = get_last_memorized_item_id()
         unmemorized_items = get_next_unmemorized_page_items(
-            last_newly_memorized_item_id
+            snapshot.last_memorized_item_id
         )
-    recent_newly_memorized_items = get_today_memorized_item_ids()
+    recent_newly_memorized_items = [r["item_id"] for r in today_revisions]
 
     new_memorization_items = sorted(
         set(unmemorized_items + recent_newly_memorized_items)
@@ -1943,6 +2824,7 @@ def make_new_memorization_summary_table(auth: str, mode_ids: list[str], route: s
             auth=auth,
             mode_ids=mode_ids,
             item_ids=new_memorization_items,
+            snapshot=snapshot,
         ),
         new_memorization_items,
     )
@@ -1952,10 +2834,11 @@ def make_summary_table(
     mode_ids: list[str],
     route: str,
     auth: str,
+    snapshot: DashboardSnapshot,
     total_display_count=0,
     plan_id=None,
 ):
-    current_date = get_current_date(auth)
+    current_date = snapshot.current_date
 
     def is_review_due(item: dict) -> bool:
         """Check if item is due for review today or overdue."""
@@ -1975,26 +2858,16 @@ def make_summary_table(
 
     def has_revisions(item: dict) -> bool:
         """Check if item has revisions for current mode."""
-        return bool(
-            revisions(
-                where=f"item_id = {item['item_id']} AND mode_id = {item['mode_id']}"
-            )
-        )
+        return snapshot.mode_count(item["item_id"], item["mode_id"]) > 0
 
     def has_newly_memorized_for_today(item: dict) -> bool:
         """Check if item has newly memorized record for the current_date."""
-        newly_memorized_record = revisions(
-            where=f"item_id = {item['item_id']} AND revision_date = '{current_date}' AND mode_id = 2"
+        newly_memorized_record = snapshot.revisions_on(
+            current_date, mode_ids=[2], item_id=item["item_id"]
         )
         return len(newly_memorized_record) == 1
 
-    qry = f"""
-        SELECT hafizs_items.item_id, items.surah_name, hafizs_items.next_review, hafizs_items.last_review, hafizs_items.mode_id FROM hafizs_items
-        LEFT JOIN items on hafizs_items.item_id = items.id 
-        WHERE hafizs_items.mode_id IN ({", ".join(mode_ids)}) AND hafizs_items.hafiz_id = {auth}
-        ORDER BY hafizs_items.item_id ASC
-    """
-    ct = db.q(qry)
+    ct = snapshot.hafiz_items(mode_ids)
 
     # Route-specific condition builders
     route_conditions = {
@@ -2016,7 +2889,7 @@ def make_summary_table(
     )
     if route == "monthly_cycle":
         recent_items = get_monthly_review_item_ids(
-            auth=auth,
+            snapshot=snapshot,
             total_display_count=total_display_count,
             ct=ct,
             recent_items=recent_items,
@@ -2029,6 +2902,7 @@ def make_summary_table(
             auth=auth,
             mode_ids=mode_ids,
             item_ids=recent_items,
+            snapshot=snapshot,
             plan_id=plan_id,
         ),
         recent_items,
@@ -2036,15 +2910,15 @@ def make_summary_table(
 
 
 def get_monthly_review_item_ids(
-    auth, total_display_count, ct, recent_items, current_plan_id
+    snapshot: DashboardSnapshot, total_display_count, ct, recent_items, current_plan_id
 ):
-    current_date = get_current_date(auth)
+    current_date = snapshot.current_date
 
     def has_revisions_today(item: dict) -> bool:
         """Check if item has revisions for current mode."""
         return bool(
-            revisions(
-                where=f"item_id = {item['item_id']} AND revision_date = '{current_date}' AND mode_id = {item['mode_id']}"
+            snapshot.revisions_on(
+                current_date, mode_ids=[item["mode_id"]], item_id=item["item_id"]
             )
         )
 
@@ -2062,22 +2936,16 @@ def get_monthly_review_item_ids(
         return item["mode_id"] == 1
 
     if current_plan_id is not None:
-        # eliminate items that are already revisioned in the current plan_id
-        eligible_item_ids = [
-            i
-            for i in recent_items
-            if not revisions(
-                where=f"item_id = {i} AND mode_id = 1 AND plan_id = {current_plan_id} AND revision_date != '{current_date}'"
-            )
+        # The plan revisions are ordered by revision_date and id
+        previous_plan_revisions = [
+            r for r in snapshot.plan_revisions if r["revision_date"] != current_date
         ]
+        # eliminate items that are already revisioned in the current plan_id
+        revisioned_item_ids = {r["item_id"] for r in previous_plan_revisions}
+        eligible_item_ids = [i for i in recent_items if i not in revisioned_item_ids]
         # TODO: handle the new user that not have any revision/plan_id
-        last_added_revision = revisions(
-            where=f"revision_date <> '{current_date}' AND mode_id = 1 AND plan_id = {current_plan_id}",
-            order_by="revision_date DESC, id DESC",
-            limit=1,
-        )
         last_added_item_id = (
-            last_added_revision[0].item_id if last_added_revision else 0
+            previous_plan_revisions[-1]["item_id"] if previous_plan_revisions else 0
         )
 
         next_item_id = find_next_greater(eligible_item_ids, last_added_item_id)
@@ -2110,7 +2978,9 @@ def get_monthly_review_item_ids(
 ######## New Summary Table ########
 
 
-def render_summary_table(auth, route, mode_ids, item_ids, plan_id=None):
+def render_summary_table(
+    auth, route, mode_ids, item_ids, snapshot: DashboardSnapshot, plan_id=None
+):
     is_accordion = route != "monthly_cycle"
     mode_id_mapping = {
         "monthly_cycle": 1,
@@ -2122,15 +2992,15 @@ def render_summary_table(auth, route, mode_ids, item_ids, plan_id=None):
     mode_id = mode_id_mapping[route]
     is_newly_memorized = mode_id == 2
     is_monthly_review = mode_id == 1
-    current_date = get_current_date(auth)
+    current_date = snapshot.current_date
     # This list is to close the accordian, if all the checkboxes are selected
     is_all_selected = []
 
     def render_range_row(item_id: str):
         row_id = f"{route}-row-{item_id}"
-        plan_condition = f"AND plan_id = {plan_id}" if is_monthly_review else ""
-        current_revision_data = revisions(
-            where=f"revision_date = '{current_date}' AND item_id = {item_id} AND mode_id IN ({", ".join(mode_ids)}) {plan_condition}"
+        plan_condition = {"plan_id": plan_id} if is_monthly_review else {}
+        current_revision_data = snapshot.revisions_on(
+            current_date, mode_ids=mode_ids, item_id=item_id, **plan_condition
         )
         is_checked = len(current_revision_data) != 0
         is_all_selected.append(is_checked)
@@ -2159,9 +3029,9 @@ def render_summary_table(auth, route, mode_ids, item_ids, plan_id=None):
 
         if current_revision_data:
             current_rev_data = current_revision_data[0]
-            default_rating = current_rev_data.rating
+            default_rating = current_rev_data["rating"]
             change_rating_hx_attrs = {
-                "hx_put": f"/revision/{current_rev_data.id}",
+                "hx_put": f"/revision/{current_rev_data['id']}",
                 "hx_swap": "none",
             }
         else:
@@ -2177,10 +3047,11 @@ def render_summary_table(auth, route, mode_ids, item_ids, plan_id=None):
 
         # This is to show the interval for srs based on the rating
         if mode_id == 5:
+            rating_intervals = snapshot.rating_intervals(item_id, is_edit=is_checked)
             custom_rating_dict = {
-                "1": f"✅ Good - {get_interval_based_on_rating(item_id=item_id, rating=1, is_edit=is_checked,is_dropdown=True)}",
-                "0": f"😄 Ok - {get_interval_based_on_rating(item_id=item_id, rating=0, is_edit=is_checked,is_dropdown=True)}",
-                "-1": f"❌ Bad - {get_interval_based_on_rating(item_id=item_id, rating=-1, is_edit=is_checked,is_dropdown=True)}",
+                "1": f"✅ Good - {rating_intervals[1]}",
+                "0": f"😄 Ok - {rating_intervals[0]}",
+                "-1": f"❌ Bad - {rating_intervals[-1]}",
             }
         else:
             custom_rating_dict = RATING_MAP
@@ -2194,16 +3065,16 @@ def render_summary_table(auth, route, mode_ids, item_ids, plan_id=None):
             **change_rating_hx_attrs,
         )
 
-        revs = revisions(where=f"item_id = {item_id} AND mode_id = {mode_id}")
+        rep_count = snapshot.mode_count(item_id, mode_id)
         if mode_id == 5:
-            rep_denominator = len(get_srs_interval_list(item_id))
+            rep_denominator = len(snapshot.srs_interval_list(item_id))
         else:
             rep_denominator = 7
-        progress = P(Strong(len(revs)), Span(f"/{rep_denominator}"))
+        progress = P(Strong(rep_count), Span(f"/{rep_denominator}"))
         return Tr(
-            Td(get_page_description(item_id)),
+            Td(snapshot.page_description(item_id)),
             Td(
-                get_start_text(item_id),
+                snapshot.items[item_id]["start_text"],
                 cls=TextT.lg,
             ),
             Td(progress) if not (is_newly_memorized or is_monthly_review) else None,
@@ -2221,9 +3092,9 @@ def render_summary_table(auth, route, mode_ids, item_ids, plan_id=None):
 
     body_rows = list(map(render_range_row, item_ids))
     # unique_page_count = len(set(map(get_page_number, item_ids)))
-    target_page_count = get_page_count(item_ids=item_ids)
-    progress_page_count = get_page_count(
-        revisions(where=f"mode_id = {mode_id} and revision_date = '{current_date}'")
+    target_page_count = snapshot.page_count(item_ids)
+    progress_page_count = snapshot.revision_page_count(
+        current_date, mode_ids=[mode_id]
     )
     summary_count = render_progress_display(progress_page_count, target_page_count)
     if not body_rows:
@@ -2303,7 +3174,7 @@ def render_summary_table(auth, route, mode_ids, item_ids, plan_id=None):
     )
     return (
         AccordionItem(
-            Span(f"{modes[mode_id].name} - ", summary_count, id=f"{route}-header"),
+            Span(f"{snapshot.modes[mode_id].name} - ", summary_count, id=f"{route}-header"),
             render_output,
             open=(not all(is_all_selected)),
         )
@@ -2339,6 +3210,7 @@ def update_status_from_index(
 
 @app.post("/home/bulk_add")
 def update_multiple_items_from_index(
+    auth,
     mode_id: int,
     date: str,
     item_id: list[int],
@@ -2347,27 +3219,18 @@ def update_multiple_items_from_index(
     plan_id: str = None,
     is_select_all: bool = False,
 ):
-    for o in zip(item_id, rating, is_checked):
-        current_item_id, current_rating, current_is_checked = o
-        if not is_select_all:
-            checkbox_update_logic(
-                mode_id=mode_id,
-                rating=current_rating,
-                item_id=current_item_id,
-                date=date,
-                is_checked=is_select_all,
-                plan_id=plan_id,
-            )
-        else:
-            if not current_is_checked:
-                checkbox_update_logic(
-                    mode_id=mode_id,
-                    rating=current_rating,
-                    item_id=current_item_id,
-                    date=date,
-                    is_checked=is_select_all,
-                    plan_id=plan_id,
-                )
+    # On select all, only the unchecked items are added
+    # and on unselect all, all the items are removed
+    entries = [
+        (current_item_id, current_rating, is_select_all)
+        for current_item_id, current_rating, current_is_checked in zip(
+            item_id, rating, is_checked
+        )
+        if not (is_select_all and current_is_checked)
+    ]
+    bulk_update_revisions(
+        auth=auth, mode_id=mode_id, date=date, entries=entries, plan_id=plan_id
+    )
 
     return RedirectResponse("/", status_code=303)
 
@@ -2380,7 +3243,7 @@ def update_status_as_newly_memorized(
     revisions_data = revisions(where=qry)
     current_date = get_current_date(auth)
     if not revisions_data and is_checked:
-        revisions.insert(
+        inserted_revision = revisions.insert(
             hafiz_id=auth,
             item_id=item_id,
             revision_date=current_date,
@@ -2406,6 +3269,7 @@ def update_status_as_newly_memorized(
             },
             hafizs_items_id,
         )
+        apply_revision_stats_delta(inserted_revision)
     elif revisions_data and not is_checked:
         revisions.delete(revisions_data[0].id)
         hafizs_items_data = hafizs_items(
@@ -2414,8 +3278,8 @@ def update_status_as_newly_memorized(
         del hafizs_items_data.status
         hafizs_items_data.mode_id = 1
         hafizs_items.update(hafizs_items_data)
+        populate_hafizs_items_stat_columns(item_id=item_id)
 
-    populate_hafizs_items_stat_columns(item_id=item_id)
     referer = request.headers.get("Referer")
     return RedirectResponse(referer, status_code=303)
 
@@ -2427,7 +3291,7 @@ def bulk_update_status_as_newly_memorized(
     current_date = get_current_date(auth)
 
     for item_id in item_ids:
-        revisions.insert(
+        inserted_revision = revisions.insert(
             hafiz_id=auth,
             item_id=item_id,
             revision_date=current_date,
@@ -2453,8 +3317,8 @@ def bulk_update_status_as_newly_memorized(
             },
             hafizs_items_id,
         )
+        apply_revision_stats_delta(inserted_revision)
 
-    populate_hafizs_items_stat_columns(item_id=item_id)
     referer = request.headers.get("Referer")
     return Redirect(referer)
 
@@ -2464,10 +3328,75 @@ def list_tables(auth):
     return tables_main_area(auth=auth)
 
 
+TABLE_PAGE_SIZE = 50
+
+
 @app.get("/tables/{table}")
-def view_table(table: str, auth):
-    records = db.q(f"SELECT * FROM {table}")
+def view_table(
+    table: str,
+    auth,
+    req: Request,
+    page: int = 1,
+    sort_col: str = "id",
+    sort_type: str = "asc",
+):
     columns = get_column_headers(table)
+    column_types = get_column_and_its_type(table)
+    # Every non empty query param named after a column is a filter (text columns match a substring)
+    filters = {
+        column: value
+        for column, value in req.query_params.items()
+        if column in columns and value != ""
+    }
+    conditions, params = [], []
+    for column, value in filters.items():
+        if str in get_args(column_types[column]):
+            conditions.append(f"[{column}] LIKE ?")
+            params.append(f"%{value}%")
+        else:
+            conditions.append(f"[{column}] = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    sort_col = sort_col if sort_col in columns else columns[0]
+    sort_type = "desc" if sort_type.lower() == "desc" else "asc"
+    total = db.execute(f"SELECT COUNT(*) FROM {table} {where}", params).fetchone()[0]
+    last_page = max((total + TABLE_PAGE_SIZE - 1) // TABLE_PAGE_SIZE, 1)
+    page = min(max(page, 1), last_page)
+    records = db.q(
+        f"""
+        SELECT * FROM {table} {where}
+        ORDER BY [{sort_col}] {sort_type}, rowid {sort_type}
+        LIMIT {TABLE_PAGE_SIZE} OFFSET {(page - 1) * TABLE_PAGE_SIZE}
+        """,
+        params,
+    )
+
+    def _table_url(**changes):
+        query = {"sort_col": sort_col, "sort_type": sort_type, "page": page}
+        return f"/tables/{table}?{urlencode(query | filters | changes)}"
+
+    def _render_header(column: str):
+        is_sorted = column == sort_col
+        next_sort_type = "desc" if is_sorted and sort_type == "asc" else "asc"
+        arrow = {"asc": " ▲", "desc": " ▼"}[sort_type] if is_sorted else ""
+        return Th(
+            A(
+                f"{column}{arrow}",
+                href=_table_url(sort_col=column, sort_type=next_sort_type, page=1),
+            )
+        )
+
+    def _render_filter(column: str):
+        return Th(
+            Input(
+                name=column,
+                value=filters.get(column, ""),
+                form="table_filters",
+                placeholder="Filter",
+                cls="min-w-16",
+            )
+        )
 
     def _render_rows(data: dict):
         def render_cell(column: str):
@@ -2497,9 +3426,37 @@ def view_table(table: str, auth):
         )
 
     table_element = Table(
-        Thead(Tr(*map(Th, columns), Th("Action"))),
+        Thead(
+            Tr(*map(_render_header, columns), Th("Action")),
+            Tr(*map(_render_filter, columns), Th(Button("Filter", form="table_filters"))),
+        ),
         Tbody(*map(_render_rows, records)),
     )
+    # The filter inputs live in the table header, they are attached to this form by their `form` attribute
+    filter_form = Form(
+        Hidden(name="sort_col", value=sort_col),
+        Hidden(name="sort_type", value=sort_type),
+        id="table_filters",
+        action=f"/tables/{table}",
+        method="GET",
+    )
+    first_row = (page - 1) * TABLE_PAGE_SIZE + 1 if total else 0
+    pagination = DivFullySpaced(
+        Span(f"{first_row}-{(page - 1) * TABLE_PAGE_SIZE + len(records)} of {total} rows"),
+        DivLAligned(
+            (
+                A(Button("Previous", type="button"), href=_table_url(page=page - 1))
+                if page > 1
+                else None
+            ),
+            Span(f"Page {page} of {last_page}"),
+            (
+                A(Button("Next", type="button"), href=_table_url(page=page + 1))
+                if page < last_page
+                else None
+            ),
+        ),
+    )
     return tables_main_area(
         Div(
             DivFullySpaced(
@@ -2526,7 +3483,9 @@ def view_table(table: str, auth):
                     ),
                 ),
             ),
+            filter_form,
             Div(table_element, cls="uk-overflow-auto"),
+            pagination,
             cls="space-y-3",
         ),
         active_table=table,
@@ -2622,7 +3581,15 @@ async def update_record(table: str, record_id: int, redirect_link: str, req: Req
         if key != "redirect_link"
     }
 
+    if table == "items":
+        before = get_item_weight_keys([record_id])
     tables[table].update(current_data, record_id)
+    invalidate_metadata(table)
+    if table == "items":
+        rebuild_daily_progress(before, get_item_weight_keys([record_id]))
+    # The intervals of the SRS items depend on their booster pack
+    if table == "srs_booster_pack":
+        recalculate_all_srs_intervals(booster_pack_id=record_id)
 
     return RedirectResponse(redirect_link, status_code=303)
 
@@ -2630,7 +3597,12 @@ async def update_record(table: str, record_id: int, redirect_link: str, req: Req
 @app.delete("/tables/{table}/{record_id}")
 def delete_record(table: str, record_id: int):
     try:
+        if table == "items":
+            before = get_item_weight_keys([record_id])
         tables[table].delete(record_id)
+        invalidate_metadata(table)
+        if table == "items":
+            rebuild_daily_progress(before, {})
     except Exception as e:
         return Tr(Td(P(f"Error: {e}"), colspan="11", cls="text-center"))
 
@@ -2652,28 +3624,85 @@ def new_record_view(table: str, auth):
 async def create_new_record(table: str, req: Request):
     formt_data = await req.form()
     current_data = formt_data.__dict__.get("_dict")
-    tables[table].insert(current_data)
+    record = tables[table].insert(current_data)
+    invalidate_metadata(table)
+    if table == "items":
+        rebuild_daily_progress({}, get_item_weight_keys([record.id]))
     return Redirect(f"/tables/{table}")
 
 
-@app.get("/tables/{table}/export")
-def export_specific_table(table: str):
-    df = pd.DataFrame(tables[table](), columns=get_column_and_its_type(table).keys())
+EXPORT_CHUNK_SIZE = 1000
+# Column used by the date filters of the export
+EXPORT_DATE_COLUMNS = {"revisions": "revision_date"}
+
+
+def stream_table_csv(qry: str, params: list, columns: list, compress: bool = False):
+    """
+    Yield the rows of the query as CSV, `EXPORT_CHUNK_SIZE` rows at a time (gzipped if `compress`).
+    It reads from its own read-only connection, as the generator is consumed outside the request's thread.
+    """
+    conn = db.read_only.open()
+    gzip = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(rows):
+        buffer = StringIO()
+        csv.writer(buffer).writerows(rows)
+        data = buffer.getvalue().encode("utf-8")
+        return gzip.compress(data) if gzip else data
+
+    try:
+        yield encode([columns])
+        for rows in batched(conn.execute(qry, params), EXPORT_CHUNK_SIZE):
+            yield encode(rows)
+        if gzip:
+            yield gzip.flush()
+    finally:
+        conn.close()
 
-    csv_buffer = BytesIO()
-    df.to_csv(csv_buffer, index=False, header=True)
-    csv_buffer.seek(0)
 
-    file_name = f"{table}.csv"
+@app.get("/tables/{table}/export")
+def export_specific_table(
+    table: str,
+    auth,
+    start_date: str = None,
+    end_date: str = None,
+    hafiz_id: int = None,
+    compress: bool = False,
+):
+    if table not in db.table_names():
+        return Response(f"Unknown table: {table}", status_code=404)
+
+    columns = list(db.table(table).columns_dict)
+    conditions, params = [], []
+    # The hafiz owned tables are exported for the current hafiz, unless another hafiz is given
+    if hafiz_id is None and table in HAFIZ_SCOPED_TABLES:
+        hafiz_id = auth
+    if hafiz_id is not None and "hafiz_id" in columns:
+        conditions.append("hafiz_id = ?")
+        params.append(hafiz_id)
+    date_column = EXPORT_DATE_COLUMNS.get(table)
+    if date_column and start_date:
+        conditions.append(f"{date_column} >= ?")
+        params.append(start_date)
+    if date_column and end_date:
+        conditions.append(f"{date_column} <= ?")
+        params.append(end_date)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    select = ", ".join(f"[{column}]" for column in columns)
+    qry = f"SELECT {select} FROM {table} {where} ORDER BY rowid"
+
+    file_name = f"{table}.csv.gz" if compress else f"{table}.csv"
     return StreamingResponse(
-        csv_buffer,
-        media_type="text/csv",
+        stream_table_csv(qry, params, columns, compress),
+        media_type="application/gzip" if compress else "text/csv",
         headers={"Content-Disposition": f"attachment; filename={file_name}"},
     )
 
 
 @app.get("/tables/{table}/import")
-def import_specific_table_view(table: str):
+def import_specific_table_view(table: str, sess):
+    # A preview left from a previous visit is abandoned
+    discard_import_previews([get_import_preview_key(sess, table)])
     form = Form(
         UploadZone(
             DivCentered(Span("Upload Zone"), UkIcon("upload")),
@@ -2695,6 +3724,16 @@ def import_specific_table_view(table: str):
         ),
         action=f"/tables/{table}/import",
         method="POST",
+        id="import_form",
+        hx_post=f"/tables/{table}/import",
+        hx_encoding="multipart/form-data",
+        target_id="import_result",
+    )
+    # Polled only while the upload is running (htmx adds `htmx-request` to the form)
+    progress = Div(
+        id="import_progress",
+        hx_get=f"/tables/{table}/import/progress",
+        hx_trigger="every 1s [document.getElementById('import_form').classList.contains('htmx-request')]",
     )
     return tables_main_area(
         Titled(
@@ -2706,6 +3745,8 @@ def import_specific_table_view(table: str):
                 ),
             ),
             form,
+            progress,
+            Div(id="import_result"),
             Div(id="preview_table"),
             cls="space-y-4",
         ),
@@ -2713,18 +3754,100 @@ def import_specific_table_view(table: str):
     )
 
 
-@app.post("/tables/{table}/import/preview")
-async def import_specific_table_preview(table: str, file: UploadFile):
-    file_content = await file.read()
-    imported_df = pd.read_csv(BytesIO(file_content)).fillna("")
-    columns = imported_df.columns.tolist()
-    records = imported_df.to_dict(orient="records")
-
-    # Check if the columns match the table's columns
-    if sorted(columns) != sorted(get_column_headers(table)):
+IMPORT_PREVIEW_ROWS = 50
+# The previews not imported nor re-opened within this time are considered abandoned
+IMPORT_PREVIEW_TTL = 3600
+# (session preview id, table) -> the copy of the previewed upload on disk (its filename and
+# creation time), to page through it
+import_previews = {}
+import_previews_lock = threading.Lock()
+
+
+def get_import_preview_key(sess, table: str):
+    """Key of the preview of the session, every browser session gets its own previews"""
+    if "import_preview_id" not in sess:
+        sess["import_preview_id"] = secrets.token_hex(16)
+    return (sess["import_preview_id"], table)
+
+
+def discard_import_previews(keys=None):
+    """Delete the copies of the `keys` previews, and of all the abandoned ones"""
+    expired = time.time() - IMPORT_PREVIEW_TTL
+    with import_previews_lock:
+        stale = [
+            key
+            for key, preview in import_previews.items()
+            if key in (keys or ()) or preview["created"] < expired
+        ]
+        stale = [import_previews.pop(key) for key in stale]
+    for preview in stale:
+        try:
+            os.remove(preview["path"])
+        except FileNotFoundError:
+            pass
+
+
+def infer_csv_type(values: pd.Series):
+    """Python type of a column parsed by pandas, integers with empty cells are parsed as floats"""
+    values = values.dropna()
+    if pd.api.types.is_integer_dtype(values) or (
+        pd.api.types.is_float_dtype(values) and (values % 1 == 0).all()
+    ):
+        return int
+    if pd.api.types.is_float_dtype(values):
+        return float
+    return str
+
+
+def render_import_preview(sess, table: str, page: int = 1):
+    preview = import_previews.get(get_import_preview_key(sess, table))
+    if preview is None:
+        return P("Please upload the CSV file again", cls="text-red-500")
+    path, filename = preview["path"], preview["filename"]
+    size = IMPORT_PREVIEW_ROWS
+
+    # Only the requested page (and one more row, to know if there is a next page) is parsed
+    try:
+        rows = pd.read_csv(
+            path,
+            dtype=str,
+            keep_default_na=False,
+            skiprows=range(1, (page - 1) * size + 1),
+            nrows=size + 1,
+        )
+        sample = pd.read_csv(path, nrows=size)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
         return Div(
-            H3("Filename: ", file.filename),
-            P("Please check the columns in the CSV file", cls="text-red-500"),
+            H3("Filename: ", filename),
+            P(f"Please check the CSV file: {e}", cls="text-red-500"),
+        )
+    columns = rows.columns.tolist()
+    has_next = len(rows) > size
+    rows = rows.head(size)
+
+    expected_types = {
+        column: (get_args(_type) or (_type,))[0]
+        for column, _type in get_column_and_its_type(table).items()
+    }
+    inferred_types = {
+        column: infer_csv_type(values)
+        for column, values in sample.items()
+    }
+    unknown_columns = [column for column in columns if column not in expected_types]
+    missing_columns = [column for column in expected_types if column not in columns]
+
+    def _render_type(column: str):
+        expected = expected_types.get(column)
+        inferred = inferred_types[column]
+        compatible = {int: (int,), float: (int, float), str: (int, float, str)}
+        valid = expected is not None and inferred in compatible[expected]
+        return Th(
+            column,
+            Br(),
+            Span(
+                f"{inferred.__name__} → {expected.__name__}" if expected else "unknown",
+                cls=TextPresets.muted_sm if valid else "text-red-500",
+            ),
         )
 
     def _render_rows(data: dict):
@@ -2732,42 +3855,251 @@ async def import_specific_table_preview(table: str, file: UploadFile):
             *map(lambda col: Td(data[col]), columns),
         )
 
+    def _page_button(label: str, page: int):
+        return Button(
+            label,
+            hx_get=f"/tables/{table}/import/preview?page={page}",
+            target_id="preview_table",
+            hx_push_url="false",
+        )
+
     preview_table = Table(
-        Thead(Tr(*map(Th, columns))),
-        Tbody(*map(_render_rows, records)),
+        Thead(Tr(*map(_render_type, columns))),
+        Tbody(*map(_render_rows, rows.to_dict(orient="records"))),
+    )
+    return Div(
+        H3("Filename: ", filename),
+        (
+            P(f"Unknown columns: {', '.join(unknown_columns)}", cls="text-red-500")
+            if unknown_columns
+            else None
+        ),
+        (
+            P(f"Missing columns: {', '.join(missing_columns)}", cls=TextPresets.muted_sm)
+            if missing_columns
+            else None
+        ),
+        Div(preview_table, cls="overflow-x-auto"),
+        DivFullySpaced(
+            _page_button("Previous", page - 1) if page > 1 else Span(),
+            Span(f"Page {page}"),
+            _page_button("Next", page + 1) if has_next else Span(),
+        ),
+        cls="space-y-4",
     )
-    return Div(H3("Filename: ", file.filename), Div(preview_table))
+
+
+@app.post("/tables/{table}/import/preview")
+def import_specific_table_preview(table: str, file: UploadFile, sess):
+    if table not in db.table_names():
+        return Response(f"Unknown table: {table}", status_code=404)
+    # Keep a copy of the upload on disk, so the other pages can be read from it later
+    key = get_import_preview_key(sess, table)
+    discard_import_previews([key])
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "wb") as copy:
+        shutil.copyfileobj(file.file, copy)
+    with import_previews_lock:
+        import_previews[key] = {"path": path, "filename": file.filename, "created": time.time()}
+    return render_import_preview(sess, table)
+
+
+@app.get("/tables/{table}/import/preview")
+def import_specific_table_preview_page(table: str, sess, page: int = 1):
+    return render_import_preview(sess, table, max(page, 1))
+
+
+IMPORT_CHUNK_SIZE = 5000
+# Only the first errors are kept and shown, the import is rolled back anyway
+MAX_IMPORT_ERRORS = 100
+# table -> number of rows processed by the running import
+import_progress = {}
+
+
+class CsvImportError(Exception):
+    """Raised to roll back an import with invalid rows"""
+
+
+def coerce_csv_value(value: str, _type):
+    """Convert a CSV cell to the column type, empty cells are NULL"""
+    if value == "":
+        return None
+    if _type is int:
+        # Integers exported through pandas (with NULLs) look like "2.0"
+        try:
+            return int(value.removesuffix(".0"))
+        except ValueError:
+            raise ValueError(f"{value!r} is not an integer")
+    if _type is float:
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"{value!r} is not a number")
+    return value
+
+
+def import_csv(table: str, lines, hafiz_id: int = None) -> tuple[int, list]:
+    """
+    Upsert the CSV rows into the table with one `INSERT ... ON CONFLICT` executemany per chunk,
+    all in one transaction. The cells are coerced to the column types, if any row is invalid
+    nothing is imported.
+
+    The rows of the hafiz scoped tables are imported for `hafiz_id`.
+
+    Returns:
+        tuple: (number of imported rows, [(row number, error message)] (the first MAX_IMPORT_ERRORS))
+    """
+    reader = csv.reader(lines)
+    header = next(reader, [])
+    column_types = {
+        column: (get_args(_type) or (_type,))[0]
+        for column, _type in get_column_and_its_type(table).items()
+    }
+    unknown_columns = [column for column in header if column not in column_types]
+    if not header or unknown_columns or len(set(header)) != len(header):
+        return 0, [(0, f"Invalid columns: {', '.join(header)}")]
+
+    columns = list(header)
+    scoped = table in HAFIZ_SCOPED_TABLES and hafiz_id is not None
+    if scoped and "hafiz_id" not in columns:
+        columns.append("hafiz_id")
+    types = [column_types[column] for column in columns]
+    not_null = {c.name for c in db.table(table).columns if c.notnull and not c.is_pk}
+
+    pks = db.table(table).pks
+    qry = f"""
+        INSERT INTO {table} ({", ".join(f"[{c}]" for c in columns)})
+        VALUES ({", ".join("?" for _ in columns)})
+    """
+    if set(pks) <= set(columns):
+        updates = [column for column in columns if column not in pks]
+        set_clause = ", ".join(f"[{c}] = excluded.[{c}]" for c in updates)
+        qry += f" ON CONFLICT ({', '.join(pks)}) DO "
+        qry += f"UPDATE SET {set_clause}" if updates else "NOTHING"
+        # Never overwrite the record of another hafiz
+        if scoped and updates:
+            qry += f" WHERE {table}.hafiz_id = excluded.hafiz_id"
+
+    def _parse_row(row: list):
+        if len(row) != len(header):
+            raise ValueError(f"expected {len(header)} values, got {len(row)}")
+        if scoped:
+            row = row[: len(header)] + [str(hafiz_id)] * (len(columns) - len(header))
+            row[columns.index("hafiz_id")] = str(hafiz_id)
+        values = []
+        for column, _type, value in zip(columns, types, row):
+            try:
+                values.append(coerce_csv_value(value, _type))
+            except ValueError as e:
+                raise ValueError(f"{column}: {e}")
+            if values[-1] is None and column in not_null:
+                raise ValueError(f"{column}: is required")
+        return values
+
+    imported, errors = 0, []
+
+    def _add_error(row_number: int, error: str):
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append((row_number, error))
+
+    import_progress[table] = 0
+    try:
+        with db.conn:
+            for chunk in batched(enumerate(reader, start=1), IMPORT_CHUNK_SIZE):
+                rows = []
+                for row_number, row in chunk:
+                    # Blank lines (eg: a trailing newline) are skipped, as pd.read_csv does
+                    if not row:
+                        continue
+                    try:
+                        rows.append(_parse_row(row))
+                    except ValueError as e:
+                        _add_error(row_number, str(e))
+                # Keep validating the rest of the file, but stop writing
+                if not errors and rows:
+                    try:
+                        db.conn.executemany(qry, rows)
+                        imported += len(rows)
+                    except Exception as e:
+                        _add_error(chunk[0][0], f"rows {chunk[0][0]}-{chunk[-1][0]}: {e}")
+                import_progress[table] += len(chunk)
+            if errors:
+                raise CsvImportError()
+    except CsvImportError:
+        imported = 0
+    finally:
+        import_progress.pop(table, None)
+    return imported, errors
+
+
+@app.get("/tables/{table}/import/progress")
+def import_specific_table_progress(table: str):
+    if table not in import_progress:
+        return ""
+    return P(f"{import_progress[table]} rows processed...", cls=TextPresets.muted_sm)
 
 
 @app.post("/tables/{table}/import")
-async def import_specific_table(table: str, file: UploadFile):
-    backup_sqlite_db(DB_PATH, "data/backup")
-    # Instead of using the import_file method, we are using upsert method to import the csv file
-    # as some of the forign key values are being used in another table
-    # so we cannot truncate the table
-    file_content = await file.read()
-    data = pd.read_csv(BytesIO(file_content)).to_dict("records")
-    for record in data:
-        tables[table].upsert(record)
+def import_specific_table(table: str, file: UploadFile, auth, sess):
+    if table not in db.table_names():
+        return Response(f"Unknown table: {table}", status_code=404)
+    # The preview (if any) is done with once the file is submitted
+    discard_import_previews([get_import_preview_key(sess, table)])
+    # The import upserts over the existing rows, the snapshot keeps them in case it was the wrong file
+    if run_backup(wait=True) is None:
+        return P(
+            f"The backup before the import failed, nothing was imported: {backup_progress['error']}",
+            cls="text-red-500",
+        )
+    # The upload is read line by line from its spooled file, instead of loading it in memory
+    lines = TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    if table == "items":
+        before = get_item_weight_keys()
+    imported, errors = import_csv(table, lines, hafiz_id=auth)
+    if errors:
+        return Div(
+            P(
+                f"{'At least ' if len(errors) >= MAX_IMPORT_ERRORS else ''}{len(errors)} invalid rows "
+                f"in {file.filename}, nothing was imported",
+                cls="text-red-500",
+            ),
+            Table(
+                Thead(Tr(Th("Row"), Th("Error"))),
+                Tbody(*[Tr(Td(row), Td(error)) for row, error in errors]),
+            ),
+        )
+
+    invalidate_metadata(table)
+    if table == "items":
+        rebuild_daily_progress(before, get_item_weight_keys())
 
     return Redirect(f"/tables/{table}")
 
 
 # this function is used to create infinite scroll for the revisions table
-def generate_revision_table_part(part_num: int = 1, size: int = 20) -> Tuple[Tr]:
-    start = (part_num - 1) * size
-    end = start + size
-    data = revisions(order_by="id desc")[start:end]
-
-    def _render_rows(rev: Revision):
-        item_id = rev.item_id
-        item_details = items[item_id]
-        page = item_details.page_id
+# `cursor` is the id of the last rendered revision (keyset pagination), so each part costs the same
+def generate_revision_table_part(auth, cursor: int = None, size: int = 20) -> Tuple[Tr]:
+    cursor_condition = f"AND revisions.id < {cursor}" if cursor else ""
+    qry = f"""
+        SELECT revisions.id, revisions.item_id, revisions.mode_id, revisions.plan_id, revisions.rating,
+        revisions.revision_date, items.page_id, items.part, surahs.name AS surah_name, pages.juz_number
+        FROM revisions
+        LEFT JOIN items ON revisions.item_id = items.id
+        LEFT JOIN surahs ON items.surah_id = surahs.id
+        LEFT JOIN pages ON items.page_id = pages.id
+        WHERE revisions.hafiz_id = {auth} {cursor_condition}
+        ORDER BY revisions.id DESC
+        LIMIT {size}
+    """
+    data = db.q(qry)
+
+    def _render_rows(rev: dict):
+        page = rev["page_id"]
         return Tr(
             Td(
                 CheckboxX(
                     name="ids",
-                    value=rev.id,
+                    value=rev["id"],
                     cls="revision_ids",
                     # To trigger the checkboxChanged event to the bulk edit and bulk delete buttons
                     _="on click send checkboxChanged to .toggle_btn",
@@ -2777,37 +4109,37 @@ def generate_revision_table_part(part_num: int = 1, size: int = 20) -> Tuple[Tr]
             Td(
                 A(
                     page,
-                    href=f"/revision/edit/{rev.id}",
+                    href=f"/revision/edit/{rev["id"]}",
                     cls=AT.muted,
                 )
             ),
             # FIXME: Added temporarly to check is the date is added correctly and need to remove this
-            Td(item_details.part),
-            Td(rev.mode_id),
-            Td(rev.plan_id),
-            Td(render_rating(rev.rating)),
-            Td(get_surah_name(item_id=item_id)),
-            Td(pages[page].juz_number),
-            Td(date_to_human_readable(rev.revision_date)),
+            Td(rev["part"]),
+            Td(rev["mode_id"]),
+            Td(rev["plan_id"]),
+            Td(render_rating(rev["rating"])),
+            Td(rev["surah_name"]),
+            Td(rev["juz_number"]),
+            Td(date_to_human_readable(rev["revision_date"])),
             Td(
                 A(
                     "Delete",
-                    hx_delete=f"/revision/delete/{rev.id}",
-                    target_id=f"revision-{rev.id}",
+                    hx_delete=f"/revision/delete/{rev["id"]}",
+                    target_id=f"revision-{rev["id"]}",
                     hx_swap="outerHTML",
                     hx_confirm="Are you sure?",
                     cls=AT.muted,
                 ),
             ),
-            id=f"revision-{rev.id}",
+            id=f"revision-{rev["id"]}",
         )
 
     paginated = [_render_rows(i) for i in data]
 
-    if len(paginated) == 20:
+    if len(paginated) == size:
         paginated[-1].attrs.update(
             {
-                "get": f"revision?idx={part_num + 1}",
+                "get": f"revision?idx={data[-1]['id']}",
                 "hx-trigger": "revealed",
                 "hx-swap": "afterend",
                 "hx-select": "tbody > tr",
@@ -2817,7 +4149,7 @@ def generate_revision_table_part(part_num: int = 1, size: int = 20) -> Tuple[Tr]
 
 
 @app.get
-def revision(auth, idx: int | None = 1):
+def revision(auth, idx: int | None = None):
     table = Table(
         Thead(
             Tr(
@@ -2834,7 +4166,7 @@ def revision(auth, idx: int | None = 1):
                 Th("Action"),
             )
         ),
-        Tbody(*generate_revision_table_part(part_num=idx)),
+        Tbody(*generate_revision_table_part(auth=auth, cursor=idx)),
         x_data=select_all_checkbox_x_data(class_name="revision_ids"),
     )
     return main_area(
@@ -2967,7 +4299,7 @@ def bulk_edit_view(ids: str, auth):
     def _render_row(id):
         current_revision = revisions[id]
         current_item_id = current_revision.item_id
-        item_details = items[current_item_id]
+        item_details = get_metadata("items")[current_item_id]
         return Tr(
             Td(get_page_description(current_item_id)),
             # Td(P(item_details.page_id)),
@@ -3190,7 +4522,7 @@ def post(revision_details: Revision):
     hafizs_items.update({"status": "memorized"}, hafizs_items_id)
 
     rev = revisions.insert(revision_details)
-    populate_hafizs_items_stat_columns(item_id=item_id)
+    apply_revision_stats_delta(rev)
 
     next_item_id = find_next_item_id(item_id)
 
@@ -3466,8 +4798,6 @@ async def post(
         if name.startswith("rating-"):
             item_id = name.split("-")[1]
             if item_id in item_ids:
-                hafizs_items_id = hafizs_items(where=f"item_id = {item_id}")[0].id
-                hafizs_items.update({"status": "memorized"}, hafizs_items_id)
                 parsed_data.append(
                     Revision(
                         item_id=int(item_id),
@@ -3479,11 +4809,22 @@ async def post(
                     )
                 )
 
-    revisions.insert_all(parsed_data)
-
-    # Update the stat columns for the added items
-    for rec in parsed_data:
-        populate_hafizs_items_stat_columns(item_id=rec.item_id)
+    if parsed_data:
+        with db.conn:
+            # updating the status of the items to memorized
+            db.execute(
+                f"""
+                UPDATE hafizs_items SET status = 'memorized'
+                WHERE hafiz_id = {auth} AND item_id IN ({", ".join(str(rec.item_id) for rec in parsed_data)})
+                """
+            )
+            bulk_update_revisions(
+                auth=auth,
+                mode_id=1,
+                date=revision_date,
+                entries=[(rec.item_id, rec.rating, True) for rec in parsed_data],
+                plan_id=plan_id,
+            )
 
     if parsed_data:
         last_item_id = parsed_data[-1].item_id
@@ -3542,12 +4883,13 @@ def show_page_status(current_type: str, auth, sess, status: str = ""):
     missing_item_ids = [r["id"] for r in ct]
 
     if missing_item_ids:
-        for missing_item_id in missing_item_ids:
-            hafizs_items.insert(
-                item_id=missing_item_id,
-                page_number=get_page_number(missing_item_id),
-                mode_id=1,
-            )
+        with writable():
+            for missing_item_id in missing_item_ids:
+                hafizs_items.insert(
+                    item_id=missing_item_id,
+                    page_number=get_page_number(missing_item_id),
+                    mode_id=1,
+                )
 
     def render_row_based_on_type(type_number: str, records: list, current_type):
         status_name = records[0]["status"]
@@ -3580,7 +4922,7 @@ def show_page_status(current_type: str, auth, sess, status: str = ""):
         title = (
             f"{current_type.capitalize()} {type_number}"
             if current_type != "surah"
-            else surahs[type_number].name
+            else get_metadata("surahs")[int(type_number)].name
         )
         item_length = 1
         existing_status = standardize_column(status_value)
@@ -3958,7 +5300,7 @@ def load_descendant_items_for_profile(
                 ),
             ),
             Td(record["page_number"]),
-            Td(surahs[record["surah_id"]].name),
+            Td(get_metadata("surahs")[int(record["surah_id"])].name),
             Td(f"Juz {record['juz_number']}"),
             Td(current_status),
         )
@@ -4183,14 +5525,145 @@ async def profile_page_custom_status_update(
         return Redirect(close_url)
 
 
+######## Backups ########
+# Snapshots are taken on a background thread (every BACKUP_INTERVAL_HOURS, 0 to disable) with the
+# online backup API, a few pages at a time. `/backup` downloads the latest snapshot.
+
+BACKUP_DIR = "data/backup"
+BACKUP_INTERVAL_HOURS = float(os.environ.get("BACKUP_INTERVAL_HOURS", 24))
+BACKUP_PAGES_PER_STEP = int(os.environ.get("BACKUP_PAGES_PER_STEP", 256))
+BACKUP_STEP_PAUSE = 0.01
+# Retention: the last snapshots, and the newest snapshot of the last days and weeks
+BACKUP_KEEP_LAST = int(os.environ.get("BACKUP_KEEP_LAST", 3))
+BACKUP_KEEP_DAILY = int(os.environ.get("BACKUP_KEEP_DAILY", 7))
+BACKUP_KEEP_WEEKLY = int(os.environ.get("BACKUP_KEEP_WEEKLY", 4))
+
+backup_lock = threading.Lock()
+backup_progress = {"running": False, "remaining": 0, "pagecount": 0, "error": None}
+
+
+def acquire_backup(blocking: bool = False):
+    """Claim `backup_lock` and mark the backup as running, False if one is already running (unless `blocking`)"""
+    if not backup_lock.acquire(blocking=blocking):
+        return False
+    backup_progress.update(running=True, remaining=0, pagecount=0, error=None)
+    return True
+
+
+def take_backup():
+    """Take a snapshot and apply the retention policy, `acquire_backup` must have claimed the lock"""
+    try:
+        path = backup_sqlite_db(
+            DB_PATH,
+            BACKUP_DIR,
+            pages_per_step=BACKUP_PAGES_PER_STEP,
+            pause=BACKUP_STEP_PAUSE,
+            on_progress=lambda remaining, pagecount: backup_progress.update(
+                remaining=remaining, pagecount=pagecount
+            ),
+        )
+        prune_backups(BACKUP_DIR, BACKUP_KEEP_LAST, BACKUP_KEEP_DAILY, BACKUP_KEEP_WEEKLY)
+        compress_backups(BACKUP_DIR)
+        return path
+    except Exception as e:
+        # Runs on a background thread, the error is shown on the backup page
+        traceback.print_exc()
+        backup_progress["error"] = str(e) or type(e).__name__
+        return None
+    finally:
+        backup_progress["running"] = False
+        backup_lock.release()
+
+
+def run_backup(wait: bool = False):
+    """Take a snapshot now, unless a backup is already running (with `wait`, after it)"""
+    if acquire_backup(blocking=wait):
+        return take_backup()
+    return None
+
+
+def start_backup():
+    """Take a snapshot on a background thread, the progress is `running` as soon as this returns"""
+    if acquire_backup():
+        threading.Thread(target=take_backup, daemon=True).start()
+
+
+def backup_scheduler():
+    """Take a snapshot whenever the latest one is older than BACKUP_INTERVAL_HOURS"""
+    while True:
+        backups = list_backups(BACKUP_DIR)
+        age = (datetime.now() - backups[0][0]).total_seconds() if backups else None
+        if age is None or age >= BACKUP_INTERVAL_HOURS * 3600:
+            run_backup()
+        time.sleep(60)
+
+
+def start_backup_scheduler():
+    if BACKUP_INTERVAL_HOURS > 0:
+        threading.Thread(target=backup_scheduler, daemon=True).start()
+
+
+app.router.on_startup.append(start_backup_scheduler)
+
+
+def render_backup_progress():
+    if backup_progress["running"]:
+        done = backup_progress["pagecount"] - backup_progress["remaining"]
+        percent = done * 100 // backup_progress["pagecount"] if backup_progress["pagecount"] else 0
+        return Div(
+            P(f"Backing up the database... {percent}%"),
+            id="backup_progress",
+            hx_get="/backup/progress",
+            hx_trigger="every 1s",
+            hx_swap="outerHTML",
+        )
+    retry = Form(Button("Back up now", cls=ButtonT.primary), method="post", action="/backup")
+    if backup_progress["error"]:
+        return Div(
+            P(f"The backup failed: {backup_progress['error']}", cls="text-red-500"),
+            retry,
+            id="backup_progress",
+        )
+    if not list_backups(BACKUP_DIR):
+        return Div(P("No backup yet"), retry, id="backup_progress")
+    return Div(
+        P("The backup is ready"),
+        A("Download", href="/backup", hx_boost="false", cls=AT.classic),
+        id="backup_progress",
+    )
+
+
 @app.get
 def backup():
     if not os.path.exists(DB_PATH):
         return Titled("Error", P("Database file not found"))
 
-    backup_path = backup_sqlite_db(DB_PATH, "data/backup")
+    backups = list_backups(BACKUP_DIR)
+    if not backups:
+        # Unless the last attempt failed, which is shown instead of retrying on every visit
+        if not backup_progress["error"]:
+            start_backup()
+        return Titled("Backup", render_backup_progress())
+
+    # FileResponse streams the file, the latest snapshot is kept uncompressed
+    backup_path = backups[0][1]
+    file_name = "quran_backup.db.gz" if backup_path.endswith(".gz") else "quran_backup.db"
+    return FileResponse(backup_path, filename=file_name)
+
+
+@app.get("/backup/progress")
+def backup_progress_view():
+    return render_backup_progress()
+
+
+@app.post("/backup")
+def create_backup():
+    """Take a new snapshot now (in the background)"""
+    start_backup()
+    return Titled("Backup", render_backup_progress())
+
 
-    return FileResponse(backup_path, filename="quran_backup.db")
+######## END ########
 
 
 def graduate_btn_recent_review(
@@ -4209,8 +5682,12 @@ def graduate_btn_recent_review(
     )
 
 
-@app.get("/recent_review")
-def recent_review_view(auth):
+# Number of days (columns) of the recent review grid, older days are loaded on demand
+RECENT_REVIEW_DAYS = 14
+
+
+def get_recent_review_items():
+    """(item_id, mode_id) of the recent review and watch list items, the ungraduated ones first"""
     hafiz_items_data = hafizs_items(where="mode_id IN (2,3,4)", order_by="item_id ASC")
     items_id_with_mode = [
         {
@@ -4221,74 +5698,130 @@ def recent_review_view(auth):
     ]
     # custom sort order to group the graduated and ungraduated
     items_id_with_mode.sort(key=lambda x: (x["mode_id"], x["item_id"]))
+    return items_id_with_mode
 
-    # To get the earliest date from revisions based on the item_id
-    item_ids = [item["item_id"] for item in items_id_with_mode]
+
+def get_recent_review_grid(auth, item_ids: list, dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Item x date matrix of the mode (2 or 3) of the recent review revisions, NaN when there is none.
+    The revisions of all the dates are read with one query and pivoted in memory.
+    """
     qry = f"""
-    SELECT MIN(revision_date) as earliest_date
-    FROM revisions
-    WHERE item_id IN ({", ".join(map(str, item_ids))})
+        SELECT item_id, revision_date, mode_id FROM revisions
+        WHERE hafiz_id = {auth} AND mode_id IN (2, 3)
+        AND item_id IN ({", ".join(map(str, item_ids))})
+        AND revision_date BETWEEN '{dates.min():%Y-%m-%d}' AND '{dates.max():%Y-%m-%d}'
     """
-    ct = db.q(qry)
-    earliest_date = ct[0]["earliest_date"]
+    df = pd.DataFrame(db.q(qry), columns=["item_id", "revision_date", "mode_id"])
+    # A new memorization (mode 2) takes precedence over a recent review on the same date
+    return df.pivot_table(
+        index="item_id", columns="revision_date", values="mode_id", aggfunc="min"
+    ).reindex(index=item_ids, columns=dates.strftime("%Y-%m-%d"))
 
-    # generate last ten days for column header
-    # earliest_date = calculate_date_difference(days=10, date_format="%Y-%m-%d")
 
-    current_date = get_current_date(auth)
-    # Change the date range to start from the earliest date
-    date_range = pd.date_range(
-        start=(earliest_date or current_date), end=current_date, freq="D"
-    )[::-1]
+def get_earliest_recent_review_date(auth, item_ids: list):
+    qry = f"""
+        SELECT MIN(revision_date) AS earliest_date FROM revisions
+        WHERE hafiz_id = {auth} AND item_id IN ({", ".join(map(str, item_ids))})
+    """
+    return db.q(qry)[0]["earliest_date"]
 
-    def render_row(o):
-        item_id, mode_id = o["item_id"], o["mode_id"]
 
-        def render_checkbox(date):
-            formatted_date = date.strftime("%Y-%m-%d")
-            current_revision_data = revisions(
-                where=f"revision_date = '{formatted_date}' AND item_id = {item_id} AND mode_id IN (2,3);"
-            )
+def get_recent_review_date_range(auth, item_ids: list, end_date: str, days: int):
+    """
+    The `days` dates up to `end_date` (newest first), but not before the earliest revision,
+    and whether there are older dates to load
+    """
+    earliest_date = get_earliest_recent_review_date(auth, item_ids) or end_date
+    start_date = max(
+        pd.Timestamp(end_date) - pd.Timedelta(days=days - 1), pd.Timestamp(earliest_date)
+    )
+    date_range = pd.date_range(start=start_date, end=end_date, freq="D")[::-1]
+    return date_range, start_date > pd.Timestamp(earliest_date)
 
-            # To render the checkbox as intermidiate image
-            if current_revision_data:
-                is_newly_memorized = current_revision_data[0].mode_id == 2
-            else:
-                is_newly_memorized = False
 
-            return Td(
-                Form(
-                    Hidden(name="date", value=formatted_date),
-                    CheckboxX(
-                        name=f"is_checked",
-                        value="1",
-                        hx_post=f"/recent_review/update_status/{item_id}",
-                        target_id=f"count-{item_id}",
-                        checked=True if current_revision_data else False,
-                        _at_change="updateVisibility($event.target)",
-                        # This @click is to handle the shift+click.
-                        _at_click=f"handleShiftClick($event, 'date-{formatted_date}')",
-                        disabled=(mode_id == 4) or is_newly_memorized,
-                        cls=(
-                            "hidden",
-                            "disabled:opacity-50",
-                            # date-<class> is to identify the row for shift+click
-                            f"date-{formatted_date}",
-                            (
-                                # If it is newly memorized then render the intermidiate checkbox icon
-                                "checked:bg-[image:var(--uk-form-checkbox-image-indeterminate)]"
-                                if is_newly_memorized
-                                else ""
-                            ),
-                        ),
+def render_recent_review_checkbox(item_id: int, mode_id: int, date, revision_mode):
+    formatted_date = date.strftime("%Y-%m-%d")
+    # To render the checkbox as intermidiate image
+    is_newly_memorized = revision_mode == 2
+
+    return Td(
+        Form(
+            Hidden(name="date", value=formatted_date),
+            CheckboxX(
+                name=f"is_checked",
+                value="1",
+                hx_post=f"/recent_review/update_status/{item_id}",
+                target_id=f"count-{item_id}",
+                checked=not pd.isna(revision_mode),
+                _at_change="updateVisibility($event.target)",
+                # This @click is to handle the shift+click.
+                _at_click=f"handleShiftClick($event, 'date-{formatted_date}')",
+                disabled=(mode_id == 4) or is_newly_memorized,
+                cls=(
+                    "hidden",
+                    "disabled:opacity-50",
+                    # date-<class> is to identify the row for shift+click
+                    f"date-{formatted_date}",
+                    (
+                        # If it is newly memorized then render the intermidiate checkbox icon
+                        "checked:bg-[image:var(--uk-form-checkbox-image-indeterminate)]"
+                        if is_newly_memorized
+                        else ""
                     ),
-                    cls="",
                 ),
-                Span("-", cls="hidden"),
-                cls="text-center",
+            ),
+            cls="",
+        ),
+        Span("-", cls="hidden"),
+        cls="text-center",
+    )
+
+
+def render_recent_review_headers(date_range, has_older: bool, days: int):
+    headers = [
+        Th(date.strftime("%b %d %a"), cls="!text-center sm:min-w-28")
+        for date in date_range
+    ]
+    if has_older:
+        # Replaced by the older date columns (and a new button) when clicked
+        oldest_date = date_range[-1].strftime("%Y-%m-%d")
+        headers.append(
+            Th(
+                Button(
+                    "Older",
+                    hx_get=f"/recent_review/older?before={oldest_date}&days={days}",
+                    hx_target="closest th",
+                    hx_swap="outerHTML",
+                    cls=(ButtonT.default, ButtonT.xs),
+                ),
+                cls="!text-center",
             )
+        )
+    return headers
+
+
+@app.get("/recent_review")
+def recent_review_view(auth, days: int = RECENT_REVIEW_DAYS):
+    items_id_with_mode = get_recent_review_items()
+    item_ids = [item["item_id"] for item in items_id_with_mode]
+
+    current_date = get_current_date(auth)
+    date_range, has_older = get_recent_review_date_range(
+        auth, item_ids, current_date, max(days, 1)
+    )
+    grid = get_recent_review_grid(auth, item_ids, date_range)
+    revision_counts = {
+        r["item_id"]: r["count"]
+        for r in db.q(
+            f"SELECT item_id, COUNT(*) AS count FROM revisions WHERE hafiz_id = {auth} AND mode_id = 3 GROUP BY item_id"
+        )
+    }
 
-        revision_count = get_mode_count(item_id, 3)
+    def render_row(o):
+        item_id, mode_id = o["item_id"], o["mode_id"]
+        revision_count = revision_counts.get(item_id, 0)
+        revision_modes = grid.loc[item_id]
 
         return Tr(
             Td(get_page_description(item_id), cls="sticky left-0 z-20 bg-white"),
@@ -4308,7 +5841,10 @@ def recent_review_view(auth):
                     cls=(FlexT.block, FlexT.center, FlexT.middle, "min-h-11"),
                 )
             ),
-            *map(render_checkbox, date_range),
+            *[
+                render_recent_review_checkbox(item_id, mode_id, date, revision_mode)
+                for date, revision_mode in zip(date_range, revision_modes)
+            ],
             id=f"row-{item_id}",
         )
 
@@ -4319,10 +5855,7 @@ def recent_review_view(auth):
                 Th("Start Text", cls="min-w-28"),
                 Th("Count"),
                 Th("Graduate"),
-                *[
-                    Th(date.strftime("%b %d %a"), cls="!text-center sm:min-w-28")
-                    for date in date_range
-                ],
+                *render_recent_review_headers(date_range, has_older, days),
             )
         ),
         Tbody(*map(render_row, items_id_with_mode)),
@@ -4348,6 +5881,37 @@ def recent_review_view(auth):
     )
 
 
+@app.get("/recent_review/older")
+def recent_review_older_columns(auth, before: str, days: int = RECENT_REVIEW_DAYS):
+    """The date columns before `before`: the headers replace the "Older" button, the cells are appended to the rows"""
+    items_id_with_mode = get_recent_review_items()
+    item_ids = [item["item_id"] for item in items_id_with_mode]
+
+    end_date = (pd.Timestamp(before) - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    date_range, has_older = get_recent_review_date_range(
+        auth, item_ids, end_date, max(days, 1)
+    )
+    grid = get_recent_review_grid(auth, item_ids, date_range)
+
+    def render_cells(o):
+        item_id, mode_id = o["item_id"], o["mode_id"]
+        # Table elements have to be in a template to be swapped out of band
+        return Template(
+            Tr(
+                *[
+                    render_recent_review_checkbox(item_id, mode_id, date, revision_mode)
+                    for date, revision_mode in zip(date_range, grid.loc[item_id])
+                ],
+                hx_swap_oob=f"beforeend:#row-{item_id}",
+            )
+        )
+
+    return (
+        *render_recent_review_headers(date_range, has_older, days),
+        *map(render_cells, items_id_with_mode),
+    )
+
+
 @app.post("/recent_review/update_status/{item_id}")
 def update_status_for_recent_review(item_id: int, date: str, is_checked: bool = False):
 
@@ -4397,11 +5961,25 @@ def watch_list_view(auth):
     week_column = ["Week 1", "Week 2", "Week 3", "Week 4", "Week 5", "Week 6", "Week 7"]
 
     # This is to only get the watch_list item_id (which are not graduated yet)
+    watch_list_condition = "(mode_id = 4 OR watch_list_graduation_date IS NOT NULL)"
     hafiz_items_data = hafizs_items(
-        where=f"(mode_id = 4 OR watch_list_graduation_date IS NOT NULL) AND hafiz_id = {auth}",
+        where=f"{watch_list_condition} AND hafiz_id = {auth}",
         order_by="mode_id DESC, next_review ASC, item_id ASC",
     )
 
+    # The watch list revisions of all the items in one query, in order, so the nth revision is week n
+    qry = f"""
+        SELECT revisions.id, revisions.item_id, revisions.revision_date, revisions.rating
+        FROM revisions
+        WHERE revisions.hafiz_id = {auth} AND revisions.mode_id = 4 AND revisions.item_id IN (
+            SELECT item_id FROM hafizs_items WHERE {watch_list_condition} AND hafiz_id = {auth}
+        )
+        ORDER BY revisions.item_id, revisions.revision_date, revisions.id
+    """
+    watch_list_revisions_by_item = defaultdict(list)
+    for rev in db.q(qry):
+        watch_list_revisions_by_item[rev["item_id"]].append(rev)
+
     def graduate_btn_watch_list(
         item_id, is_graduated=False, is_disabled=False, **kwargs
     ):
@@ -4422,12 +6000,9 @@ def watch_list_view(auth):
         is_graduated = hafiz_item.mode_id == 1
         last_review = hafiz_item.last_review
 
-        watch_list_revisions = revisions(
-            where=f"item_id = {item_id} AND mode_id = 4", order_by="revision_date ASC"
-        )
-        weeks_revision_excluded = week_column[len(watch_list_revisions) :]
-
-        revision_count = get_mode_count(item_id, 4)
+        watch_list_revisions = watch_list_revisions_by_item[item_id]
+        revision_count = len(watch_list_revisions)
+        weeks_revision_excluded = week_column[revision_count:]
 
         if not is_graduated:
             due_day = day_diff(last_review, current_date)
@@ -4453,10 +6028,10 @@ def watch_list_view(auth):
                 cls="text-center",
             )
 
-        def render_rev(rev: Revision):
-            rev_date = rev.revision_date
+        def render_rev(rev: dict):
+            rev_date = rev["revision_date"]
             ctn = (
-                render_rating(rev.rating).split()[0],
+                render_rating(rev["rating"]).split()[0],
                 (
                     f" {date_to_human_readable(rev_date)}"
                     if not (rev_date == current_date)
@@ -4467,7 +6042,7 @@ def watch_list_view(auth):
                 (
                     A(
                         *ctn,
-                        hx_get=f"/watch_list/edit/{rev.id}",
+                        hx_get=f"/watch_list/edit/{rev["id"]}",
                         target_id="my-modal-body",
                         data_uk_toggle="target: #my-modal",
                         cls=AT.classic,
@@ -4543,10 +6118,7 @@ def watch_list_view(auth):
     content_body = Div(
         H2("Watch List"),
         Div(
-            rating_dropdown(
-                id="global_rating",
-                cls="flex-1",
-            ),
+            Div(rating_dropdown(id="global_rating"), cls="flex-1"),
             LabelInput(
                 "Revision Date",
                 name="revision_date",
@@ -4651,7 +6223,7 @@ def watch_list_delete_data(id: int, item_id: int):
 @app.post("/watch_list/add")
 def watch_list_add_data(revision_details: Revision, auth):
     revision_details.mode_id = 4
-    revisions.insert(revision_details)
+    inserted_revision = revisions.insert(revision_details)
     item_id = revision_details.item_id
 
     revision_count = get_mode_count(item_id, 4)
@@ -4661,7 +6233,7 @@ def watch_list_add_data(revision_details: Revision, auth):
         return RedirectResponse(f"/watch_list", status_code=303)
 
     update_review_dates(item_id, 4)
-    populate_hafizs_items_stat_columns(item_id=item_id)
+    apply_revision_stats_delta(inserted_revision)
 
     return RedirectResponse("/watch_list", status_code=303)
 
@@ -4705,14 +6277,25 @@ def import_db(auth):
 
 
 @app.post
-async def import_db(file: UploadFile):
-    path = "data/" + file.filename
+def import_db(file: UploadFile):
+    path = "data/" + os.path.basename(file.filename)
     if DB_PATH == path:
         return Titled("Error", P("Cannot overwrite the current DB"))
+    if not path.endswith(".db"):
+        return Titled("Error", P("Please upload a .db file"))
 
-    file_content = await file.read()
-    with open(path, "wb") as f:
-        f.write(file_content)
+    # The upload is copied in chunks next to its destination, and only moved there once it is validated
+    fd, temp_path = tempfile.mkstemp(dir="data", suffix=".partial")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(file.file, f)
+        prepare_uploaded_db(temp_path)
+        os.replace(temp_path, path)
+    except ValueError as e:
+        return Titled("Error", P(str(e)))
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
     return RedirectResponse(index)
 
@@ -4799,8 +6382,8 @@ def render_row_based_on_type(
 
         if _type == "Surah":
             _type = ""
-            first_description = surahs[first_description].name
-            last_description = surahs[last_description].name
+            first_description = get_metadata("surahs")[int(first_description)].name
+            last_description = get_metadata("surahs")[int(last_description)].name
 
         if len(list) == 1:
             return f"{_type} {first_description}"
@@ -4819,7 +6402,7 @@ def render_row_based_on_type(
     title = (
         f"{current_type.capitalize()} {type_number}"
         if current_type != "surah"
-        else surahs[type_number].name
+        else get_metadata("surahs")[int(type_number)].name
     )
 
     filter_url = f"/new_memorization/expand/{current_type}/{type_number}"
@@ -5160,7 +6743,7 @@ def load_descendant_items_for_new_memorization(
                 ),
             ),
             Td(record["page_number"]),
-            Td(surahs[record["surah_id"]].name),
+            Td(get_metadata("surahs")[int(record["surah_id"])].name),
             Td(f"Juz {record['juz_number']}"),
         )
 
@@ -5697,12 +7280,123 @@ def page_description_edit_form(item_id: int):
 
 
 ######################### SRS Pages #########################
+SRS_PAGE_SIZE = 50
+
+# column -> SQL expression of the (sortable, filterable) SRS columns, `:current_date` is bound when querying
+SRS_ELIGIBLE_COLUMNS = {
+    "page": "pages.page_number",
+    "start_text": "CASE WHEN items.id IS NULL THEN '-' ELSE items.start_text END",
+    "bad_streak": "hafizs_items.bad_streak",
+    "last_review_date": "hafizs_items.last_review",
+    "bad_%": "CASE WHEN hafizs_items.count > 0 THEN ROUND(hafizs_items.bad_count * 100.0 / hafizs_items.count, 1) ELSE 0 END",
+    "total_count": "hafizs_items.count",
+    "bad_count": "hafizs_items.bad_count",
+}
+SRS_CURRENT_COLUMNS = {
+    "page": "pages.page_number",
+    "start_text": "CASE WHEN items.id IS NULL THEN '-' ELSE items.start_text END",
+    "last_review": "hafizs_items.last_review",
+    "next_review": "hafizs_items.next_review",
+    # "-" is rendered for the items without a next review
+    "due": "COALESCE(CAST(julianday(:current_date) - julianday(hafizs_items.next_review) AS INTEGER), -1)",
+    "last_interval": "hafizs_items.last_interval",
+    "current_interval": "hafizs_items.current_interval",
+    "next_interval": "hafizs_items.next_interval",
+}
+# Selected with every SRS table, for the links and the page description (see `render_page_description`)
+SRS_ITEM_COLUMNS = {
+    "item_id": "hafizs_items.item_id",
+    "description": "items.description",
+    "surah_name": "surahs.name",
+}
+
+
+def query_srs_table(
+    columns: dict,
+    where: str,
+    params: dict,
+    order_by: list[tuple[str, str]],
+    filter_col: str = None,
+    filter_value: str = None,
+    page: int = 1,
+):
+    """
+    One page of the hafizs_items (joined to items, pages and surahs) with the computed `columns`
+    and the SRS_ITEM_COLUMNS, sorted by `order_by` ((column, "asc" or "desc") pairs, ties broken by
+    the item) and filtered by a substring of `filter_col`.
+
+    Returns:
+        tuple: (rows of the page, total number of rows)
+    """
+    params = dict(params)
+    if filter_col in columns and filter_value:
+        where += f" AND CAST({columns[filter_col]} AS TEXT) LIKE :filter_value"
+        params["filter_value"] = f"%{filter_value}%"
+    order = ", ".join(
+        [
+            f"[{column}] {'DESC' if sort_type == 'desc' else 'ASC'}"
+            for column, sort_type in order_by
+            if column in columns
+        ]
+        + ["[item_id] ASC"]
+    )
+    select = ", ".join(
+        f"{expr} AS [{column}]" for column, expr in (columns | SRS_ITEM_COLUMNS).items()
+    )
+    from_where = f"""
+        FROM hafizs_items
+        LEFT JOIN items ON hafizs_items.item_id = items.id
+        LEFT JOIN pages ON items.page_id = pages.id
+        LEFT JOIN surahs ON items.surah_id = surahs.id
+        WHERE {where}
+    """
+    total = db.execute(f"SELECT COUNT(*) {from_where}", params).fetchone()[0]
+    rows = db.q(
+        f"""
+        SELECT {select} {from_where}
+        ORDER BY {order}
+        LIMIT {SRS_PAGE_SIZE} OFFSET {(max(page, 1) - 1) * SRS_PAGE_SIZE}
+        """,
+        params,
+    )
+    return rows, total
+
+
+def render_srs_pagination(total: int, page: int, page_url, target: str):
+    """Previous/Next buttons of a SRS table, `page_url(page)` is the url of a page"""
+    last_page = max((total + SRS_PAGE_SIZE - 1) // SRS_PAGE_SIZE, 1)
+    if last_page == 1:
+        return None
+
+    def _page_button(label: str, page: int):
+        return Button(
+            label,
+            type="button",
+            hx_get=page_url(page),
+            hx_target=target,
+            hx_select=target,
+            hx_swap="outerHTML",
+            hx_push_url="false",
+            cls=ButtonT.xs,
+        )
+
+    return DivFullySpaced(
+        _page_button("Previous", page - 1) if page > 1 else Span(),
+        Span(f"Page {page} of {last_page} ({total} pages)"),
+        _page_button("Next", page + 1) if page < last_page else Span(),
+    )
+
+
 @app.get("/srs")
 def srs_detailed_page_view(
     auth,
     sort_col: str = "last_review_date",
     sort_type: str = "desc",
     is_bad_streak: bool = True,
+    filter_col: str = "page",
+    filter_value: str = "",
+    page: int = 1,
+    srs_page: int = 1,
 ):
     current_date = get_current_date(auth)
 
@@ -5717,51 +7411,52 @@ def srs_detailed_page_view(
         "Bad Count",
     ]
     # based on the is_bad_steak we are filtering only the bad_streak items
-    bad_streak_items = hafizs_items(
-        where=f"mode_id <> 5 AND status IS NOT NULL {"AND bad_streak > 0" if is_bad_streak else ""}",
-        order_by="last_review DESC",
-    )
-
-    # sorted the records based on the sort_col and sort_type from the input, and after page sort to group them on main sort
-    eligible_records = []
-    for record in bad_streak_items:
-        current_item_id = record.item_id
-        total_count = record.count
-        bad_count = record.bad_count
-        bad_percent = (
-            format_number((bad_count / total_count) * 100) if total_count > 0 else 0
-        )
-        eligible_records.append(
-            {
-                "page": current_item_id,
-                "start_text": get_start_text(current_item_id),
-                "bad_streak": record.bad_streak,
-                "last_review_date": record.last_review,
-                "bad_%": bad_percent,
-                "total_count": total_count,
-                "bad_count": bad_count,
-            }
+    # the eligible pages are sorted on the sort_col and sort_type from the input, and then on the page
+    eligible_records, eligible_total = query_srs_table(
+        SRS_ELIGIBLE_COLUMNS,
+        where=f"hafizs_items.hafiz_id = :hafiz_id AND hafizs_items.mode_id <> 5 AND hafizs_items.status IS NOT NULL {"AND hafizs_items.bad_streak > 0" if is_bad_streak else ""}",
+        params={"hafiz_id": auth},
+        order_by=[(standardize_column(sort_col), sort_type.lower()), ("page", "asc")],
+        filter_col=standardize_column(filter_col),
+        filter_value=filter_value,
+        page=page,
+    )
+
+    def srs_url(**changes):
+        query = {
+            "sort_col": sort_col,
+            "sort_type": sort_type,
+            "is_bad_streak": is_bad_streak,
+            "filter_col": filter_col,
+            "filter_value": filter_value,
+            "page": page,
+            "srs_page": srs_page,
+        }
+        return f"/srs?{urlencode(query | changes)}"
+
+    def render_srs_page_description(record: dict):
+        return render_page_description(
+            record["item_id"],
+            description=record["description"],
+            page_number=record["page"],
+            surah_name=record["surah_name"],
         )
-    eligible_records = sorted(eligible_records, key=lambda x: x["page"])
-    eligible_records = sorted(
-        eligible_records, key=lambda x: x[sort_col], reverse=(sort_type == "desc")
-    )
 
     def render_srs_eligible_rows(record: dict):
-        current_item_id = record["page"]
-        page_description = get_page_description(current_item_id)
+        current_item_id = record["item_id"]
+        page_description = render_srs_page_description(record)
         start_srs_link = A(
             "Start SRS",
             hx_get=f"/start-srs/{current_item_id}",
             hx_target=f"#srs_eligible_row_{current_item_id}",
             hx_select=f"#srs_eligible_row_{current_item_id}",
             hx_select_oob="#current_srs_table",
+            hx_include="[name='booster_pack_id']",
             cls=AT.classic,
         )
+        bad_percent = format_number(record["bad_%"])
         bad_percentage = (
-            f"{record["bad_%"]}%"
-            if isinstance(record["bad_%"], int)
-            else record["bad_%"]
+            f"{bad_percent}%" if isinstance(bad_percent, int) else bad_percent
         )
         checkbox = CheckboxX(
             name=f"item_ids",
@@ -5786,6 +7481,14 @@ def srs_detailed_page_view(
         P("Sort Options: ", cls=TextT.bold),
         custom_select(name="sort_col", vals=columns, default_val=sort_col),
         custom_select(name="sort_type", vals=["ASC", "DESC"], default_val=sort_type),
+        custom_select(name="filter_col", vals=columns, default_val=filter_col),
+        Input(
+            name="filter_value",
+            value=filter_value,
+            placeholder="Filter",
+            hx_trigger="input changed delay:500ms",
+            cls="max-w-40",
+        ),
         Hidden(name="is_bad_streak", value="False"),
         LabelSwitch(
             label="Bad Streak",
@@ -5804,12 +7507,22 @@ def srs_detailed_page_view(
         hx_replace_url="true",
         hx_indicator=".htmx-indicator",
     )
-    srs_start_btn = Button(
-        "Start SRS",
-        type="button",
-        hx_post="/start-srs",
-        hx_target="body",
-        cls=(ButtonT.xs, ButtonT.primary),
+    srs_start_btn = DivLAligned(
+        Button(
+            "Start SRS",
+            type="button",
+            hx_post="/start-srs",
+            hx_target="body",
+            cls=(ButtonT.xs, ButtonT.primary),
+        ),
+        fh.Select(
+            *[
+                fh.Option(booster_pack.name, value=booster_pack.id)
+                for booster_pack in get_metadata("srs_booster_pack").values()
+            ],
+            name="booster_pack_id",
+            cls="uk-select uk-form-small w-auto",
+        ),
     )
     srs_eligible_table = Div(
         H4("Eligible Pages"),
@@ -5842,6 +7555,12 @@ def srs_detailed_page_view(
                         # if all the below checkboxes are selected.
                         x_init="updateSelectAll()",
                     ),
+                    render_srs_pagination(
+                        eligible_total,
+                        page,
+                        page_url=lambda page: srs_url(page=page),
+                        target="#srs_eligible_table",
+                    ),
                     cls="space-y-2 uk-overflow-auto h-[32vh]",
                     id="srs_eligible_table",
                 ),
@@ -5853,44 +7572,13 @@ def srs_detailed_page_view(
     )
 
     ############ current_srs_table ############
-    current_srs_items = [
-        i.item_id
-        for i in hafizs_items(
-            where=f"mode_id = 5", order_by="next_review DESC, item_id ASC"
-        )
-    ]
-
-    # To sort the current srs records by due date
-    current_srs_records = []
-    for item_id in current_srs_items:
-        hafiz_items_data = hafizs_items(where=f"item_id = {item_id}")
-        if hafiz_items_data:
-            hafiz_items_data = hafiz_items_data[0]
-            last_review = hafiz_items_data.last_review
-            next_review = hafiz_items_data.next_review
-            if next_review:
-                due = calculate_days_difference(next_review, current_date)
-            else:
-                # this is to render the "-" if there is no next page
-                due = -1
-            last_interval = hafiz_items_data.last_interval
-            current_interval = hafiz_items_data.current_interval
-            next_interval = hafiz_items_data.next_interval
-
-            current_srs_records.append(
-                {
-                    "page": item_id,
-                    "start_text": get_start_text(item_id),
-                    "last_review": last_review,
-                    "next_review": next_review,
-                    "due": due,
-                    "last_interval": last_interval,
-                    "current_interval": current_interval,
-                    "next_interval": next_interval,
-                }
-            )
-    current_srs_records = sorted(
-        current_srs_records, key=lambda x: x["due"], reverse=True
+    # sorted by the due days, the pages without a next review are rendered as due "-"
+    current_srs_records, current_srs_total = query_srs_table(
+        SRS_CURRENT_COLUMNS,
+        where="hafizs_items.hafiz_id = :hafiz_id AND hafizs_items.mode_id = 5",
+        params={"hafiz_id": auth, "current_date": current_date},
+        order_by=[("due", "desc"), ("next_review", "desc"), ("page", "asc")],
+        page=srs_page,
     )
 
     # This table shows the current srs pages for the user
@@ -5900,7 +7588,7 @@ def srs_detailed_page_view(
             due = "-"
 
         return Tr(
-            Td(get_page_description(records["page"])),
+            Td(render_srs_page_description(records)),
             Td(records["start_text"]),
             Td(render_date(records["last_review"])),
             Td(render_date(records["next_review"])),
@@ -5929,6 +7617,12 @@ def srs_detailed_page_view(
                 ),
                 Tbody(*map(render_current_srs_rows, current_srs_records)),
             ),
+            render_srs_pagination(
+                current_srs_total,
+                srs_page,
+                page_url=lambda srs_page: srs_url(srs_page=srs_page),
+                target="#current_srs_table",
+            ),
             cls="space-y-2 uk-overflow-auto h-[32vh]",
             id="current_srs_table",
         ),
@@ -5954,28 +7648,34 @@ def srs_detailed_page_view(
     )
 
 
-# This route is responsible for the adding single record
-@app.get("/start-srs/{item_id}")
-def start_srs(item_id: int, auth):
+def start_srs_for_items(auth, item_ids: list, booster_pack_id: int = 1):
+    """Move the items to SRS (mode 5) on the booster pack's start interval, with one UPDATE in a transaction"""
+    if not item_ids:
+        return
     current_date = get_current_date(auth)
-    # TODO: Currently this only takes the first booster pack from the srs_booster_pack table
-    booster_pack_details = srs_booster_pack[1]
-    srs_booster_id = booster_pack_details.id
+    booster_pack_details = get_metadata("srs_booster_pack")[booster_pack_id]
     next_interval = booster_pack_details.start_interval
     next_review_date = add_days_to_date(current_date, next_interval)
 
-    # Change the current mode_id for the item_id to 5(srs)
     # TODO: What about the status?
-    current_hafiz_items = hafizs_items(where=f"item_id = {item_id}")
-    if current_hafiz_items:
-        current_hafiz_items = current_hafiz_items[0]
-        current_hafiz_items.srs_booster_pack_id = srs_booster_id
-        current_hafiz_items.mode_id = 5
-        current_hafiz_items.next_interval = next_interval
-        current_hafiz_items.srs_start_date = current_date
-        current_hafiz_items.next_review = next_review_date
-        hafizs_items.update(current_hafiz_items)
+    with db.conn:
+        db.execute(
+            f"""
+            UPDATE hafizs_items SET srs_booster_pack_id = ?, mode_id = 5, next_interval = ?,
+            srs_start_date = ?, next_review = ?
+            WHERE hafiz_id = ? AND item_id IN ({", ".join("?" for _ in item_ids)})
+            """,
+            [booster_pack_details.id, next_interval, current_date, next_review_date, auth]
+            + [int(item_id) for item_id in item_ids],
+        )
+
 
+# This route is responsible for the adding single record
+@app.get("/start-srs/{item_id}")
+def start_srs(item_id: int, auth, booster_pack_id: int = 1):
+    if booster_pack_id not in get_metadata("srs_booster_pack"):
+        return Response(f"Unknown booster pack: {booster_pack_id}", status_code=400)
+    start_srs_for_items(auth, [item_id], booster_pack_id)
     return RedirectResponse("/srs")
 
 
@@ -5984,9 +7684,11 @@ def start_srs(item_id: int, auth):
 async def start_srs_for_multiple_records(req, auth):
     form_data = await req.form()
     item_ids = form_data.getlist("item_ids")
+    booster_pack_id = form_data.get("booster_pack_id") or "1"
+    if not booster_pack_id.isdigit() or int(booster_pack_id) not in get_metadata("srs_booster_pack"):
+        return Response(f"Unknown booster pack: {booster_pack_id}", status_code=400)
 
-    for item_id in item_ids:
-        start_srs(item_id, auth)
+    start_srs_for_items(auth, item_ids, int(booster_pack_id))
 
     return RedirectResponse(req.headers.get("referer", "/srs"), status_code=303)
 
@@ -6003,7 +7705,16 @@ def change_current_date(auth):
         hx_target="body",
         hx_trigger="change",
     )
-    return main_area(label_input, auth=auth)
+    # To catch up after a break, all the days are closed in one go
+    close_days_form = Form(
+        LabelInput(
+            label="Close days", name="days", type="number", min="1", value="1"
+        ),
+        Button("Close", cls=ButtonT.default),
+        hx_get="/close_date",
+        cls="space-y-3 mt-4",
+    )
+    return main_area(label_input, close_days_form, auth=auth)
 
 
 @app.post("/change_current_date")
@@ -6015,8 +7726,8 @@ def update_current_date(auth, current_date: str):
 
 
 @app.get("/update_stats_column")
-def update_stats_column():
-    populate_hafizs_items_stat_columns()
+def update_stats_column(auth):
+    populate_hafizs_items_stat_columns(hafiz_id=auth)
 
 
 @app.get("/settings")
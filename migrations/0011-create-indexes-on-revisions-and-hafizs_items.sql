@@ -0,0 +1,18 @@
+-- Indexes for the revisions table
+-- checkbox_update_logic, get_lastest_date and the per item/mode revision counts
+CREATE INDEX IF NOT EXISTS idx_revisions_hafiz_item_mode_date ON revisions (hafiz_id, item_id, mode_id, revision_date);
+-- datewise_summary_table and the revisions of a day (covers the item_id lookup)
+CREATE INDEX IF NOT EXISTS idx_revisions_hafiz_date_mode_item ON revisions (hafiz_id, revision_date, mode_id, item_id);
+-- Full cycle revisions of a plan
+CREATE INDEX IF NOT EXISTS idx_revisions_hafiz_mode_plan_date ON revisions (hafiz_id, mode_id, plan_id, revision_date);
+
+-- Indexes for the hafizs_items table
+-- get_hafizs_items and the joins from items/revisions
+CREATE INDEX IF NOT EXISTS idx_hafizs_items_hafiz_item ON hafizs_items (hafiz_id, item_id);
+-- make_summary_table (filtered by mode_id and ordered by item_id)
+CREATE INDEX IF NOT EXISTS idx_hafizs_items_hafiz_mode_item ON hafizs_items (hafiz_id, mode_id, item_id);
+-- Not memorized items of a page in the new memorization table
+CREATE INDEX IF NOT EXISTS idx_hafizs_items_hafiz_page ON hafizs_items (hafiz_id, page_number);
+
+-- Refresh the planner statistics for the new indexes
+ANALYZE;
@@ -0,0 +1,2 @@
+-- Revisions of a hafiz in id order, for the keyset pagination of the revision history
+CREATE INDEX IF NOT EXISTS idx_revisions_hafiz_id ON revisions (hafiz_id, id);
@@ -0,0 +1,81 @@
+-- Page weight of an item: 1 for a full page and 1/n for a part of a page with n active parts
+CREATE VIEW IF NOT EXISTS item_page_weights AS
+SELECT items.id AS item_id, 1.0 / parts.count AS weight FROM items
+JOIN (SELECT page_id, COUNT(*) AS count FROM items WHERE active = 1 GROUP BY page_id) AS parts
+ON items.page_id = parts.page_id;
+
+-- Page weighted count and ids (json array) of the revisions per hafiz, date and mode
+CREATE TABLE IF NOT EXISTS daily_progress (
+    hafiz_id INTEGER NOT NULL,
+    revision_date TEXT NOT NULL,
+    mode_id INTEGER NOT NULL,
+    page_count REAL NOT NULL DEFAULT 0,
+    revision_count INTEGER NOT NULL DEFAULT 0,
+    revision_ids TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (hafiz_id, revision_date, mode_id)
+);
+
+INSERT INTO daily_progress (hafiz_id, revision_date, mode_id, page_count, revision_count, revision_ids)
+SELECT revisions.hafiz_id, revisions.revision_date, revisions.mode_id,
+SUM(COALESCE(item_page_weights.weight, 0)), COUNT(*), json_group_array(revisions.id)
+FROM revisions
+LEFT JOIN item_page_weights ON revisions.item_id = item_page_weights.item_id
+WHERE revisions.hafiz_id IS NOT NULL AND revisions.revision_date IS NOT NULL AND revisions.mode_id IS NOT NULL
+GROUP BY revisions.hafiz_id, revisions.revision_date, revisions.mode_id;
+
+-- Keep the daily progress up to date on every write to the revisions
+CREATE TRIGGER IF NOT EXISTS daily_progress_revision_insert
+AFTER INSERT ON revisions
+WHEN NEW.hafiz_id IS NOT NULL AND NEW.revision_date IS NOT NULL AND NEW.mode_id IS NOT NULL
+BEGIN
+    INSERT INTO daily_progress (hafiz_id, revision_date, mode_id, page_count, revision_count, revision_ids)
+    VALUES (
+        NEW.hafiz_id, NEW.revision_date, NEW.mode_id,
+        COALESCE((SELECT weight FROM item_page_weights WHERE item_id = NEW.item_id), 0),
+        1, json_array(NEW.id)
+    )
+    ON CONFLICT (hafiz_id, revision_date, mode_id) DO UPDATE SET
+        page_count = page_count + excluded.page_count,
+        revision_count = revision_count + 1,
+        revision_ids = json_insert(revision_ids, '$[#]', NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_progress_revision_delete
+AFTER DELETE ON revisions
+BEGIN
+    UPDATE daily_progress SET
+        page_count = page_count - COALESCE((SELECT weight FROM item_page_weights WHERE item_id = OLD.item_id), 0),
+        revision_count = revision_count - 1,
+        revision_ids = (SELECT json_group_array(value) FROM json_each(revision_ids) WHERE value <> OLD.id)
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_id = OLD.mode_id;
+    DELETE FROM daily_progress
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_id = OLD.mode_id
+    AND revision_count <= 0;
+END;
+
+-- Moving a revision (date, mode, item or hafiz) is a delete from the old row and an insert into the new one.
+-- fastlite's update() sets every column, so only the rows where one of them actually changed are moved
+-- (eg: a rating edit keeps page_count and the order of revision_ids as they are)
+CREATE TRIGGER IF NOT EXISTS daily_progress_revision_update
+AFTER UPDATE OF hafiz_id, revision_date, mode_id, item_id ON revisions
+WHEN OLD.hafiz_id IS NOT NEW.hafiz_id OR OLD.revision_date IS NOT NEW.revision_date
+OR OLD.mode_id IS NOT NEW.mode_id OR OLD.item_id IS NOT NEW.item_id
+BEGIN
+    UPDATE daily_progress SET
+        page_count = page_count - COALESCE((SELECT weight FROM item_page_weights WHERE item_id = OLD.item_id), 0),
+        revision_count = revision_count - 1,
+        revision_ids = (SELECT json_group_array(value) FROM json_each(revision_ids) WHERE value <> OLD.id)
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_id = OLD.mode_id;
+    DELETE FROM daily_progress
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_id = OLD.mode_id
+    AND revision_count <= 0;
+    INSERT INTO daily_progress (hafiz_id, revision_date, mode_id, page_count, revision_count, revision_ids)
+    SELECT NEW.hafiz_id, NEW.revision_date, NEW.mode_id,
+        COALESCE((SELECT weight FROM item_page_weights WHERE item_id = NEW.item_id), 0),
+        1, json_array(NEW.id)
+    WHERE NEW.hafiz_id IS NOT NULL AND NEW.revision_date IS NOT NULL AND NEW.mode_id IS NOT NULL
+    ON CONFLICT (hafiz_id, revision_date, mode_id) DO UPDATE SET
+        page_count = page_count + excluded.page_count,
+        revision_count = revision_count + 1,
+        revision_ids = json_insert(revision_ids, '$[#]', NEW.id);
+END;
@@ -0,0 +1,375 @@
+"""
+Forecast the daily review load (in pages) of the recent review, watch list and SRS modes
+by rolling the schedule of every hafiz forward, day by day, over many Monte Carlo trials.
+
+The schedule follows the rules of `update_review_dates` and `graduate_reviewed_items` in main.py:
+- recent review (mode 2, 3): due every day, moves to the watch list (due after 7 days) after 7 reviews
+- watch list (mode 4): due every 7 days, memorized after 7 reviews
+- SRS (mode 5): due on its next_review, a good rating moves up the booster pack ladder, ok stays
+  and bad moves down. Memorized once the next interval is beyond the end_interval of the pack.
+Every due item is assumed to be reviewed on its due date, new memorization and the full cycle
+(daily_capacity) are not simulated. The database is only read.
+
+Usage: python simulate_srs_schedule.py [db_path] [--days 90] [--trials 1000] [--ratings good,ok,bad]
+                                       [--booster-pack id] [--hafiz id] [--seed n] [--csv path]
+"""
+
+import csv
+import sys
+import time
+import sqlite3
+import argparse
+from datetime import date, timedelta
+
+import numpy as np
+
+DB_PATH = "data/quran_v9.db"
+
+RECENT_REVIEW_COUNT = 7
+WATCH_LIST_COUNT = 7
+WATCH_LIST_INTERVAL = 7
+# The due days are int16, this keeps `day + interval` far from overflowing
+MAX_DAYS = 3650
+MODES = {3: "Recent review", 4: "Watch list", 5: "SRS"}
+
+
+def parse_srs_interval_list(interval_days: str, end_interval: int):
+    """Same as `parse_srs_interval_list` in main.py"""
+    booster_pack_intervals = list(map(int, interval_days.split(",")))
+    interval_list = [i for i in booster_pack_intervals if i < end_interval]
+    first_greater = next(
+        (i for i in booster_pack_intervals if i >= end_interval), None
+    )
+    if first_greater is not None:
+        interval_list.append(first_greater)
+    return interval_list
+
+
+def load_state(db_path, hafiz_id=None, booster_pack_id=None):
+    """
+    Read the hafizs, booster packs and scheduled items (one row per item) of the database.
+    Returns (hafizs, packs, ladders, items), the ladders and items are NumPy arrays by column.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    hafiz_condition = f"hafizs.id = {int(hafiz_id)}" if hafiz_id else "1 = 1"
+    hafizs = conn.execute(
+        f"""
+        SELECT id, name, "current_date", daily_capacity FROM hafizs
+        WHERE {hafiz_condition} ORDER BY id
+        """
+    ).fetchall()
+    packs = conn.execute(
+        """
+        SELECT id, name, interval_days, start_interval, end_interval FROM srs_booster_pack
+        ORDER BY id
+        """
+    ).fetchall()
+    # Recent review counts the revisions of mode 3, the others of their own mode
+    rows = conn.execute(
+        f"""
+        SELECT hafizs_items.hafiz_id, hafizs_items.mode_id, hafizs_items.next_interval,
+        hafizs_items.srs_booster_pack_id,
+        CAST(julianday(hafizs_items.next_review) - julianday(hafizs."current_date") AS INTEGER) AS due_in,
+        COALESCE(item_page_weights.weight, 1) AS weight,
+        (
+            SELECT COUNT(*) FROM revisions
+            WHERE revisions.hafiz_id = hafizs_items.hafiz_id AND revisions.item_id = hafizs_items.item_id
+            AND revisions.mode_id = CASE WHEN hafizs_items.mode_id = 2 THEN 3 ELSE hafizs_items.mode_id END
+        ) AS mode_count
+        FROM hafizs_items
+        JOIN hafizs ON hafizs_items.hafiz_id = hafizs.id
+        LEFT JOIN item_page_weights ON hafizs_items.item_id = item_page_weights.item_id
+        WHERE hafizs_items.mode_id IN (2, 3, 4, 5) AND {hafiz_condition}
+        """
+    ).fetchall()
+    conn.close()
+
+    if booster_pack_id is not None and booster_pack_id not in [p["id"] for p in packs]:
+        raise ValueError(f"Unknown booster pack: {booster_pack_id}")
+    pack_index = {p["id"]: i for i, p in enumerate(packs)}
+    intervals = [
+        parse_srs_interval_list(p["interval_days"], p["end_interval"]) for p in packs
+    ]
+    ladder_size = max(map(len, intervals), default=1)
+    # Padded with the last interval, the positions past `lengths` are "Finished"
+    ladders = {
+        "intervals": np.array(
+            [i + [i[-1]] * (ladder_size - len(i)) for i in intervals], dtype=np.int16
+        ).reshape(len(packs), ladder_size),
+        "lengths": np.array(list(map(len, intervals)), dtype=np.int32),
+        "end_interval": np.array([p["end_interval"] for p in packs], dtype=np.int32),
+    }
+
+    hafiz_index = {h["id"]: i for i, h in enumerate(hafizs)}
+    n = len(rows)
+    items = {
+        "hafiz": np.zeros(n, dtype=np.int32),
+        "mode": np.zeros(n, dtype=np.int8),
+        # Days from the current_date of the hafiz, int16 keeps the (trials * items) state small
+        "due": np.zeros(n, dtype=np.int16),
+        "remaining": np.zeros(n, dtype=np.int16),
+        "pack": np.zeros(n, dtype=np.int16),
+        "position": np.zeros(n, dtype=np.int16),
+        "interval": np.zeros(n, dtype=np.int16),
+        "weight": np.zeros(n, dtype=np.float32),
+    }
+    for i, r in enumerate(rows):
+        mode_id = 3 if r["mode_id"] == 2 else r["mode_id"]
+        items["hafiz"][i] = hafiz_index[r["hafiz_id"]]
+        items["mode"][i] = mode_id
+        # Overdue and unscheduled items are due on the first day
+        items["due"][i] = max(r["due_in"] or 0, 0)
+        items["weight"][i] = r["weight"]
+        if mode_id == 3:
+            items["remaining"][i] = max(RECENT_REVIEW_COUNT - r["mode_count"], 1)
+        elif mode_id == 4:
+            items["remaining"][i] = max(WATCH_LIST_COUNT - r["mode_count"], 1)
+        else:
+            index = pack_index.get(booster_pack_id or r["srs_booster_pack_id"], 0)
+            ladder = intervals[index]
+            interval = r["next_interval"] or packs[index]["start_interval"]
+            items["pack"][i] = index
+            items["interval"][i] = interval
+            # An interval below the ladder has the position -1 (triplet [cur, cur, ladder[0]]),
+            # the others snap to the first interval of the ladder >= their own
+            position = min(np.searchsorted(ladder, interval), len(ladder) - 1)
+            items["position"][i] = -1 if interval < ladder[0] else position
+    return hafizs, packs, ladders, items
+
+
+def simulate_reviews(items, hafiz_count, days=90):
+    """
+    Recent review and watch list ignore the rating, they are rolled forward once for all trials.
+    Returns the page load per (day, hafiz, mode) and the memorized pages per hafiz.
+    """
+    is_review = items["mode"] != 5
+    mode, due, remaining, hafiz, weight = (
+        items[column][is_review]
+        for column in ("mode", "due", "remaining", "hafiz", "weight")
+    )
+    never = np.iinfo(due.dtype).max
+
+    loads = np.zeros((days, hafiz_count, 2), dtype=np.float32)
+    for day in range(days):
+        cells = np.flatnonzero(due <= day)
+        loads[day] = np.bincount(
+            hafiz[cells] * 2 + mode[cells] - 3,
+            weights=weight[cells],
+            minlength=hafiz_count * 2,
+        ).reshape(hafiz_count, 2)
+        remaining[cells] -= 1
+        due[cells] = np.where(mode[cells] == 3, day + 1, day + WATCH_LIST_INTERVAL)
+        graduated = cells[remaining[cells] <= 0]
+        # recent review -> watch list and watch list -> memorized
+        is_recent_review = mode[graduated] == 3
+        due[graduated] = np.where(is_recent_review, day + WATCH_LIST_INTERVAL, never)
+        remaining[graduated] = WATCH_LIST_COUNT
+        mode[graduated] = np.where(is_recent_review, 4, 1)
+
+    is_memorized = mode == 1
+    memorized = np.bincount(
+        hafiz[is_memorized], weights=weight[is_memorized], minlength=hafiz_count
+    )
+    return loads, memorized
+
+
+def simulate_srs(
+    items,
+    ladders,
+    hafiz_count,
+    days=90,
+    trials=1000,
+    ratings=(0.6, 0.3, 0.1),
+    seed=None,
+):
+    """
+    Roll the SRS items of all the trials forward together on flat (trials * items) state arrays.
+    Each day scans the due days of all the cells, only the due cells are rated and updated.
+    Returns the page load per (trial, day, hafiz) and the memorized pages per (trial, hafiz).
+    """
+    rng = np.random.default_rng(seed)
+    good, ok = ratings[0], ratings[0] + ratings[1]
+    is_srs = items["mode"] == 5
+    due, position, interval, pack, hafiz, weight = (
+        np.tile(items[column][is_srs], trials)
+        for column in ("due", "position", "interval", "pack", "hafiz", "weight")
+    )
+    # (trial, hafiz) bucket of every cell
+    trial = np.repeat(np.arange(trials, dtype=np.int32), is_srs.sum())
+    bucket = trial * hafiz_count + hafiz
+    never = np.iinfo(due.dtype).max
+
+    loads = np.zeros((trials, days, hafiz_count), dtype=np.float32)
+    for day in range(days):
+        cells = np.flatnonzero(due <= day)
+        loads[:, day] = np.bincount(
+            bucket[cells], weights=weight[cells], minlength=trials * hafiz_count
+        ).reshape(trials, hafiz_count)
+
+        # good +1, ok 0 and bad -1 on the ladder (not below its first interval)
+        current, current_pack = position[cells], pack[cells]
+        draw = rng.random(len(cells))
+        rating = np.where(draw < good, 1, np.where(draw < ok, 0, -1))
+        new_position = np.maximum(current + rating, np.minimum(current, 0))
+        ladder_position = np.clip(new_position, 0, ladders["intervals"].shape[1] - 1)
+        new_interval = np.where(
+            new_position >= 0,
+            ladders["intervals"][current_pack, ladder_position],
+            interval[cells],
+        )
+        # SRS -> memorized
+        is_graduated = (new_position >= ladders["lengths"][current_pack]) | (
+            new_interval > ladders["end_interval"][current_pack]
+        )
+        position[cells] = new_position
+        interval[cells] = new_interval
+        due[cells] = np.where(is_graduated, never, day + new_interval)
+
+    is_memorized = due == never
+    memorized = np.bincount(
+        bucket[is_memorized],
+        weights=weight[is_memorized],
+        minlength=trials * hafiz_count,
+    ).reshape(trials, hafiz_count)
+    return loads, memorized
+
+
+def simulate(
+    items,
+    ladders,
+    hafiz_count,
+    days=90,
+    trials=1000,
+    ratings=(0.6, 0.3, 0.1),
+    seed=None,
+):
+    """
+    Returns the page load per (trial, day, hafiz, mode) and the memorized pages per (trial, hafiz)
+    """
+    review_loads, review_memorized = simulate_reviews(items, hafiz_count, days)
+    srs_loads, srs_memorized = simulate_srs(
+        items, ladders, hafiz_count, days, trials, ratings, seed
+    )
+    review_loads = np.broadcast_to(review_loads, (trials, *review_loads.shape))
+    loads = np.concatenate([review_loads, srs_loads[..., np.newaxis]], axis=3)
+    return loads, review_memorized + srs_memorized
+
+
+def report(hafizs, loads, memorized, days, csv_path=None):
+    """Print the weekly mean load per mode of each hafiz, and optionally write the daily forecast"""
+    total = loads.sum(axis=3)
+    mean = loads.mean(axis=0)
+    p90 = np.percentile(total, 90, axis=0)
+    csv_rows = []
+    for h, hafiz in enumerate(hafizs):
+        start = date.fromisoformat(hafiz["current_date"])
+        capacity = hafiz["daily_capacity"]
+        capacity = f"{capacity} pages" if capacity else "not set"
+        print(f"\n{hafiz['name']} (hafiz {hafiz['id']}), daily capacity: {capacity}")
+        print(
+            f"{'Days':<10}"
+            + "".join(f"{name:>15}" for name in MODES.values())
+            + f"{'Total':>10}{'p90':>8}"
+        )
+        for week in range(0, days, 7):
+            days_slice = slice(week, min(week + 7, days))
+            week_mean = mean[days_slice, h].mean(axis=0)
+            print(
+                f"{f'{week + 1}-{days_slice.stop}':<10}"
+                + "".join(f"{load:>15.1f}" for load in week_mean)
+                + f"{week_mean.sum():>10.1f}{p90[days_slice, h].max():>8.1f}"
+            )
+        peak = int(mean[:, h].sum(axis=1).argmax())
+        print(
+            f"Peak: {mean[peak, h].sum():.1f} pages on {start + timedelta(days=peak)} "
+            f"(p90 {p90[peak, h]:.1f}), "
+            f"{memorized[:, h].mean():.1f} pages memorized in {days} days"
+        )
+        for day in range(days):
+            csv_rows.append(
+                [hafiz["id"], (start + timedelta(days=day)).isoformat()]
+                + [f"{load:.2f}" for load in mean[day, h]]
+                + [f"{mean[day, h].sum():.2f}", f"{p90[day, h]:.2f}"]
+            )
+
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["hafiz_id", "date", *MODES.values(), "total", "total_p90"])
+            writer.writerows(csv_rows)
+        print(f"\nDaily forecast written to {csv_path}")
+
+
+def simulate_srs_schedule(
+    db_path,
+    days,
+    trials,
+    ratings,
+    booster_pack_id=None,
+    hafiz_id=None,
+    seed=None,
+    csv_path=None,
+):
+    hafizs, packs, ladders, items = load_state(db_path, hafiz_id, booster_pack_id)
+    if not hafizs:
+        print("No hafiz found")
+        return
+    start = time.perf_counter()
+    loads, memorized = simulate(
+        items, ladders, len(hafizs), days, trials, ratings, seed
+    )
+    elapsed = time.perf_counter() - start
+    pack_name = next(
+        (p["name"] for p in packs if p["id"] == booster_pack_id), "as assigned"
+    )
+    print(
+        f"{trials} trials x {len(items['mode'])} items x {days} days in {elapsed:.2f}s "
+        f"(ratings good/ok/bad: {'/'.join(map(str, ratings))}, "
+        f"booster pack: {pack_name})"
+    )
+    report(hafizs, loads, memorized, days, csv_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("db_path", nargs="?", default=DB_PATH)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--trials", type=int, default=1000)
+    parser.add_argument(
+        "--ratings", default="0.6,0.3,0.1", help="probabilities of good,ok,bad"
+    )
+    parser.add_argument(
+        "--booster-pack", type=int, help="use this booster pack for every SRS item"
+    )
+    parser.add_argument("--hafiz", type=int, help="only this hafiz (defaults to all)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--csv", help="write the daily forecast to this file")
+    args = parser.parse_args()
+
+    ratings = tuple(map(float, args.ratings.split(",")))
+    if len(ratings) != 3 or abs(sum(ratings) - 1) > 1e-6:
+        print("--ratings should be 3 probabilities (good,ok,bad) adding up to 1")
+        sys.exit(1)
+    if not 0 < args.days <= MAX_DAYS:
+        print(f"--days should be between 1 and {MAX_DAYS}")
+        sys.exit(1)
+    if args.trials <= 0:
+        print("--trials should be at least 1")
+        sys.exit(1)
+    try:
+        simulate_srs_schedule(
+            args.db_path,
+            args.days,
+            args.trials,
+            ratings,
+            args.booster_pack,
+            args.hafiz,
+            args.seed,
+            args.csv,
+        )
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
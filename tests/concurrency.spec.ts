@@ -0,0 +1,50 @@
+import { test, expect, request, APIRequestContext } from '@playwright/test';
+
+const BASE_URL = 'http://localhost:5001';
+// pages whose content depends on the hafiz scoped tables (revisions, hafizs_items)
+const HAFIZ_PAGES = ['/profile/page', '/srs', '/new_memorization/surah', '/page_details', '/recent_review'];
+const ROUNDS = 10;
+
+// element ids are random on every render, so drop them before comparing the pages
+const normalize = (html: string) => html.replace(/_[A-Za-z0-9_-]{22}/g, '');
+
+async function loginAs(hafizIndex: number) {
+  const context = await request.newContext({ baseURL: BASE_URL });
+  await context.post('/login', { form: { email: 'mailsiraj@gmail.com', password: '123' } });
+  const selection = await (await context.get('/hafiz_selection')).text();
+  const hafizIds = [...selection.matchAll(/name="current_hafiz_id" value="(\d+)"/g)].map(m => m[1]);
+  expect(hafizIds.length).toBeGreaterThan(1);
+  await context.post('/hafiz_selection', { form: { current_hafiz_id: hafizIds[hafizIndex] } });
+  return context;
+}
+
+async function getPage(context: APIRequestContext, path: string) {
+  const response = await context.get(path);
+  expect(response.ok()).toBeTruthy();
+  return normalize(await response.text());
+}
+
+test('two_hafizs_in_parallel', async () => {
+  const contexts = [await loginAs(0), await loginAs(1)];
+
+  // Reference pages of each hafiz, requested one after another
+  const expected = [];
+  for (const context of contexts) {
+    const pages = {};
+    for (const path of HAFIZ_PAGES) pages[path] = await getPage(context, path);
+    expected.push(pages);
+  }
+
+  // Interleave the same requests of both hafizs and check that nothing leaks between them
+  const checks = [];
+  for (let round = 0; round < ROUNDS; round++) {
+    contexts.forEach((context, i) => {
+      for (const path of HAFIZ_PAGES) {
+        checks.push(getPage(context, path).then(html => expect(html, `${path} of hafiz #${i}`).toBe(expected[i][path])));
+      }
+    });
+  }
+  await Promise.all(checks);
+
+  await Promise.all(contexts.map(context => context.dispose()));
+});
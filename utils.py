@@ -4,9 +4,15 @@ import re
 import sqlite3
 import os
 import itertools
+import gzip
+import shutil
+import time
+import apsw
 from fastmigrate.core import (
     create_db,
     run_migrations,
+    get_db_version,
+    get_migration_scripts,
     _ensure_meta_table,
     _set_db_version,
 )
@@ -26,6 +32,40 @@ def create_and_migrate_db(db_path):
         print("Database migration failed!")
 
 
+def prepare_uploaded_db(db_path):
+    """
+    Check that the uploaded file is a healthy database of this app and migrate it if it is behind.
+    Raises ValueError with the reason otherwise.
+    """
+    with open(db_path, "rb") as f:
+        if f.read(16) != b"SQLite format 3\x00":
+            raise ValueError("The file is not a SQLite database")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    except sqlite3.Error as e:
+        raise ValueError(f"The database could not be read: {e}")
+    finally:
+        conn.close()
+    if result != "ok":
+        raise ValueError(f"The database is corrupted: {result}")
+
+    try:
+        version = get_db_version(db_path)
+    except sqlite3.Error:
+        raise ValueError("The database has no version (_meta table)")
+    latest_version = max(get_migration_scripts("migrations/"), default=0)
+    if version > latest_version:
+        raise ValueError(
+            f"The database version ({version}) is newer than the app ({latest_version})"
+        )
+    if version < latest_version:
+        create_and_migrate_db(db_path)
+        if get_db_version(db_path) != latest_version:
+            raise ValueError(f"The database could not be migrated from version {version}")
+
+
 def flatten_list(list_of_lists):
     return list(itertools.chain(*list_of_lists))
 
@@ -275,7 +315,19 @@ def date_to_human_readable(date_string):
     return input_date.strftime("%b %d %a")
 
 
-def backup_sqlite_db(source_db_path, backup_dir):
+BACKUP_NAME_PATTERN = re.compile(r"_(\d{8}_\d{6})\.db(\.gz)?$")
+
+
+def backup_sqlite_db(
+    source_db_path, backup_dir, pages_per_step=-1, pause=0, on_progress=None
+):
+    """
+    Copy the database into a new timestamped file of `backup_dir` with SQLite's online backup API.
+
+    With `pages_per_step`, the copy is done that many pages at a time with a `pause` (in seconds)
+    in between, so the writers of the app are not locked out while it runs.
+    `on_progress(remaining, pagecount)` is called after every step.
+    """
     # Create backup directory if it doesn't exist
     os.makedirs(backup_dir, exist_ok=True)
 
@@ -284,21 +336,72 @@ def backup_sqlite_db(source_db_path, backup_dir):
     db_name = os.path.basename(source_db_path)
     backup_name = f"{os.path.splitext(db_name)[0]}_{timestamp}.db"
     backup_path = os.path.join(backup_dir, backup_name)
+    # The snapshot gets its final name only once it is complete
+    partial_path = backup_path + ".partial"
 
-    # Connect to source database
-    source = sqlite3.connect(source_db_path)
+    source = apsw.Connection(source_db_path, flags=apsw.SQLITE_OPEN_READONLY)
+    destination = apsw.Connection(partial_path)
+    try:
+        with destination.backup("main", source, "main") as backup:
+            while not backup.done:
+                try:
+                    backup.step(pages_per_step)
+                except (apsw.BusyError, apsw.LockedError):
+                    pass  # retried after the pause
+                if on_progress:
+                    on_progress(backup.remaining, backup.pagecount)
+                if not backup.done:
+                    time.sleep(pause)
+    finally:
+        destination.close()
+        source.close()
+
+    os.replace(partial_path, backup_path)
+    return backup_path
 
-    # Connect to destination database (will create it if it doesn't exist)
-    destination = sqlite3.connect(backup_path)
 
-    # Use SQLite's backup API to create the backup
-    source.backup(destination)
+def list_backups(backup_dir):
+    """(timestamp, path) of the snapshots in `backup_dir`, newest first"""
+    if not os.path.isdir(backup_dir):
+        return []
+    backups = []
+    for name in os.listdir(backup_dir):
+        match = BACKUP_NAME_PATTERN.search(name)
+        if match:
+            timestamp = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+            backups.append((timestamp, os.path.join(backup_dir, name)))
+    return sorted(backups, reverse=True)
 
-    # Close connections
-    source.close()
-    destination.close()
 
-    return backup_path
+def prune_backups(backup_dir, keep_last, keep_daily, keep_weekly):
+    """
+    Delete the snapshots outside of the retention policy: the `keep_last` newest ones,
+    and the newest one of each of the last `keep_daily` days and `keep_weekly` weeks are kept.
+    """
+    backups = list_backups(backup_dir)
+    keep = {path for _, path in backups[:keep_last]}
+    for period, count in [("%Y-%m-%d", keep_daily), ("%G-%V", keep_weekly)]:
+        seen = []
+        for timestamp, path in backups:
+            key = timestamp.strftime(period)
+            if key not in seen:
+                seen.append(key)
+                if len(seen) > count:
+                    break
+                keep.add(path)
+    for _, path in backups:
+        if path not in keep:
+            os.remove(path)
+
+
+def compress_backups(backup_dir, keep_uncompressed=1):
+    """Gzip the snapshots older than the `keep_uncompressed` newest ones"""
+    for _, path in list_backups(backup_dir)[keep_uncompressed:]:
+        if path.endswith(".gz"):
+            continue
+        with open(path, "rb") as source, gzip.open(path + ".gz", "wb") as destination:
+            shutil.copyfileobj(source, destination)
+        os.remove(path)
 
 
 def insert_between(lst, element):
@@ -454,3 +557,31 @@ def get_interval_triplet(current_interval, interval_list):
 
     # This shouldn't happen based on the given constraints
     return [current_interval, current_interval, current_interval]
+
+
+def get_interval_positions(interval_list):
+    """Position of each interval in the interval_list (the first one, if it is repeated)"""
+    positions = {}
+    for i, interval in enumerate(interval_list):
+        positions.setdefault(interval, i)
+    return positions
+
+
+def get_interval_triplet_by_position(current_interval, interval_list, positions):
+    """
+    Same as `get_interval_triplet`, but looks up the position of the current_interval
+    from the precomputed `positions` (see `get_interval_positions`) instead of scanning the list.
+    """
+    if not interval_list:
+        return [current_interval, current_interval, current_interval]
+
+    if current_interval < interval_list[0]:
+        return [current_interval, current_interval, interval_list[0]]
+
+    i = positions.get(current_interval)
+    if i is None:
+        return [current_interval, current_interval, current_interval]
+
+    left = interval_list[i - 1] if i > 0 else interval_list[i]
+    right = interval_list[i + 1] if i < len(interval_list) - 1 else "Finished"
+    return [left, interval_list[i], right]